@@ -8,7 +8,6 @@ these names so existing call sites and tests are unchanged.
 
 import logging
 import time
-from collections import deque
 
 from . import config
 from . import storage
@@ -102,9 +101,13 @@ def _build_gateway_connections_list(node_id):
         gateway_connections.append(gw_info_with_score)
     return gateway_connections
 
-def _build_node_info_from_data(node_id, data, is_special, current_time):
-    """Build complete node_info dictionary from node data."""
-    last_seen = data.get("last_seen", current_time)
+def _build_node_info_from_data(node_id, data, is_special, current_time, is_gw=None):
+    """Build complete node_info dictionary from node data.
+
+    is_gw: gateway status if the caller already worked it out (looked up otherwise).
+    """
+    get = data.get
+    last_seen = get("last_seen", current_time)
     time_since_seen = current_time - last_seen
 
     status = _calculate_node_status(time_since_seen)
@@ -112,47 +115,57 @@ def _build_node_info_from_data(node_id, data, is_special, current_time):
     stale = time_since_seen > getattr(config, 'STALE_AFTER_SECONDS', config.STATUS_ORANGE_THRESHOLD)
     channel_name = _get_node_channel_name(node_id, data, is_special)
     origin_lat, origin_lon = _get_origin_coordinates(node_id, data, is_special)
-    node_name = data.get("long_name") or data.get("longName")
+    node_name = get("long_name") or get("longName")
+    lat = get("latitude")
+    lon = get("longitude")
+    battery_pct = get("battery_pct")
+    telemetry = get("telemetry", {})
+    if not isinstance(telemetry, dict):
+        telemetry = None
+
+    # Special nodes read the voltage channel configured for their power sensor;
+    # every other node uses device_metrics, so read that directly
+    if is_special:
+        voltage = mh._get_node_voltage(node_id)
+    else:
+        voltage = telemetry.get("device_metrics", {}).get("voltage") if telemetry is not None else None
 
     # Build base node info dictionary
     node_info = {
         "id": node_id,
         "name": node_name,
-        "short": data.get("short_name") or data.get("shortName") or "?",
-        "lat": data.get("latitude"),
-        "lon": data.get("longitude"),
-        "alt": data.get("altitude"),
-        "hw_model": data.get("hw_model", "Unknown"),
-        "channel": data.get("channel"),
+        "short": get("short_name") or get("shortName") or "?",
+        "lat": lat,
+        "lon": lon,
+        "alt": get("altitude"),
+        "hw_model": get("hw_model", "Unknown"),
+        "channel": get("channel"),
         "channel_name": channel_name,
-        "modem_preset": data.get("modem_preset"),
-        "role": data.get("role"),
+        "modem_preset": get("modem_preset"),
+        "role": get("role"),
         "origin_lat": origin_lat,
         "origin_lon": origin_lon,
         "status": status,
         "is_special": is_special,
         "stale": stale,
-        "has_fix": (data.get("latitude") is not None and data.get("longitude") is not None),
+        "has_fix": (lat is not None and lon is not None),
         "special_symbol": special_symbol,
         "special_label": special_label,
         "time_since_seen": time_since_seen,
         "last_seen": last_seen,
-        "last_position_update": data.get("last_position_update"),
-        "battery_pct": data.get("battery_pct"),
+        "last_position_update": get("last_position_update"),
+        "battery_pct": battery_pct,
         "age_min": int(time_since_seen / 60),
-        "moved_far": data.get("moved_far", False),
-        "distance_from_origin_m": data.get("distance_from_origin_m"),
+        "moved_far": get("moved_far", False),
+        "distance_from_origin_m": get("distance_from_origin_m"),
         "movement_alerts_muted": storage.is_movement_muted(node_id) if is_special else False,
-        "voltage": mh._get_node_voltage(node_id),
+        "voltage": voltage,
     }
 
     # Add power current for special (power-sensor) nodes
-    telemetry = data.get("telemetry", {})
-    if isinstance(telemetry, dict):
-        power_metrics = telemetry.get("power_metrics", {})
-        node_info["power_current"] = power_metrics.get("ch3_current")
+    if telemetry is not None:
+        node_info["power_current"] = telemetry.get("power_metrics", {}).get("ch3_current")
 
-    battery_pct = node_info.get("battery_pct")
     node_info["battery_low"] = (
         battery_pct is not None and
         battery_pct < getattr(config, 'LOW_BATTERY_THRESHOLD', 50)
@@ -176,7 +189,8 @@ def _build_node_info_from_data(node_id, data, is_special, current_time):
         node_info["best_gateway"] = data["best_gateway"]
 
     # Determine if this node is a gateway
-    is_gw = mh.node_is_gateway.get(node_id, False) or node_id in mh.all_gateway_node_ids
+    if is_gw is None:
+        is_gw = mh.node_is_gateway.get(node_id, False) or node_id in mh.all_gateway_node_ids
     node_info["is_gateway"] = is_gw
 
     # Reliability summary for the gateway details view (gateway-only nodes
@@ -246,29 +260,37 @@ def _build_gateway_only_node(gateway_id, current_time):
 def get_nodes():
     """Return list of all tracked nodes with status."""
     result = []
+    result_ids = set()
     current_time = time.time()
 
+    # Read once per poll: a set for O(1) membership instead of scanning the
+    # configured id list for every node
+    special_ids = frozenset(getattr(config, 'SPECIAL_NODE_IDS', ()))
+    show_all_nodes = getattr(config, 'SHOW_ALL_NODES', False)
+    node_is_gateway = mh.node_is_gateway
+    all_gateway_node_ids = mh.all_gateway_node_ids
+
     for node_id, data in mh.nodes_data.items():
-        is_special = node_id in getattr(config, 'SPECIAL_NODE_IDS', [])
+        is_special = node_id in special_ids
+        # Worked out once here and handed to the builder, which needs it too
+        is_gw = node_is_gateway.get(node_id, False) or node_id in all_gateway_node_ids
 
         # Skip non-special, non-gateway nodes when show_all_nodes is disabled
-        if not getattr(config, 'SHOW_ALL_NODES', False):
-            if not is_special:
-                is_gateway_check = mh.node_is_gateway.get(node_id, False) or node_id in mh.all_gateway_node_ids
-                if not is_gateway_check:
-                    continue
+        if not show_all_nodes:
+            if not is_special and not is_gw:
+                continue
 
         # Build complete node info dictionary using helper
-        node_info = _build_node_info_from_data(node_id, data, is_special, current_time)
+        node_info = _build_node_info_from_data(node_id, data, is_special, current_time, is_gw)
         result.append(node_info)
+        result_ids.add(node_id)
 
-    # Add gateways that aren't already in result
-    result_ids = {n['id'] for n in result}
-    for gateway_id in mh.all_gateway_node_ids:
-        if gateway_id not in result_ids:
-            gateway_node = _build_gateway_only_node(gateway_id, current_time)
-            if gateway_node:
-                result.append(gateway_node)
+    # Add gateways that aren't already in result (the set difference is also a
+    # snapshot, so the packet worker adding a gateway mid-poll can't break the loop)
+    for gateway_id in mh.all_gateway_node_ids - result_ids:
+        gateway_node = _build_gateway_only_node(gateway_id, current_time)
+        if gateway_node:
+            result.append(gateway_node)
 
     return result
 
@@ -285,24 +307,89 @@ def get_special_history(node_id: int, hours: int = None):
     """
     hours = hours or getattr(config, 'SPECIAL_HISTORY_HOURS', 24)
     cutoff = time.time() - (hours * 3600)
+    return _history_points(mh.special_history.get(node_id), cutoff, _dedup_window_seconds())
+
+def get_all_special_history(hours: int = None):
+    """
+    get_special_history() for every configured special node, in one call.
+    The cutoff and dedup window are worked out once for all nodes.
 
-    dq = mh.special_history.get(node_id, deque())
-    filtered = [e for e in dq if e['ts'] >= cutoff]
-    deduped = _deduplicate_by_hour(filtered)
+    Returns:
+        {node_id: [points]} for each id in SPECIAL_NODE_IDS (empty list if no history)
+    """
+    hours = hours or getattr(config, 'SPECIAL_HISTORY_HOURS', 24)
+    cutoff = time.time() - (hours * 3600)
+    window_seconds = _dedup_window_seconds()
+    history = mh.special_history
+    return {node_id: _history_points(history.get(node_id), cutoff, window_seconds)
+            for node_id in getattr(config, 'SPECIAL_NODE_IDS', [])}
+
+def _history_points(ring, cutoff, window_seconds):
+    """Deduplicated API points from one HistoryRing (None/empty -> [])."""
+    if not ring:
+        return []
 
+    # Dedup on the ts column first, then build dicts only for the survivors.
+    # Indices and entries under one lock hold: the packet worker appends and
+    # compacts the columns concurrently.
+    with ring.lock:
+        keep = _latest_index_per_window(ring.ts, ring.index_of(cutoff), len(ring.ts), window_seconds)
+        entries = [ring.entry(i) for i in keep]
     result = []
-    for e in deduped:
-        v = e.get('voltage')
+    for e in entries:
+        v = e['voltage']
         result.append({
             'ts': e['ts'],
-            'lat': e.get('lat'),
-            'lon': e.get('lon'),
-            'alt': e.get('alt'),
+            'lat': e['lat'],
+            'lon': e['lon'],
+            'alt': e['alt'],
             'voltage': v,
             'battery_pct': mh._estimate_battery_from_voltage(v) if v is not None else None,
         })
     return result
 
+def _dedup_window_seconds():
+    """Deduplication window, from config.special_nodes_settings.data_limit_time (hours, default 1.0)."""
+    return config.special_nodes_settings.get('data_limit_time', 1.0) * 3600
+
+def _latest_index_per_window(ts, start, stop, window_seconds):
+    """Indices (in time order) of the most recent point per time window in ts[start:stop].
+
+    History is appended in time order, so each window is one contiguous run
+    and a single pass finds its latest point - no bucket dict, no sort. Should
+    a timestamp ever go backwards, fall back to grouping by window key.
+    """
+    keep = []
+    best = -1
+    best_ts = prev_ts = None
+    window_key = None
+    for i in range(start, stop):
+        t = ts[i]
+        if prev_ts is not None and t < prev_ts:
+            return _latest_index_per_window_unordered(ts, start, stop, window_seconds)
+        prev_ts = t
+        key = int(t / window_seconds)
+        if key != window_key:
+            if best >= 0:
+                keep.append(best)
+            window_key = key
+            best, best_ts = i, t
+        elif t > best_ts:
+            best, best_ts = i, t
+    if best >= 0:
+        keep.append(best)
+    return keep
+
+def _latest_index_per_window_unordered(ts, start, stop, window_seconds):
+    """_latest_index_per_window for timestamps that are not in order."""
+    time_buckets = {}
+    for i in range(start, stop):
+        time_key = int(ts[i] / window_seconds)  # Group by time window
+        # Keep the most recent point in each time window
+        if time_key not in time_buckets or ts[i] > ts[time_buckets[time_key]]:
+            time_buckets[time_key] = i
+    return sorted(time_buckets.values(), key=lambda i: ts[i])
+
 def _deduplicate_by_hour(points):
     """Keep only the most recent point per time window for slow-moving special nodes.
     
@@ -310,23 +397,8 @@ def _deduplicate_by_hour(points):
     """
     if not points:
         return []
-    
-    # Get deduplication window from config (in hours, default 1.0)
-    time_window_hours = config.special_nodes_settings.get('data_limit_time', 1.0)
-    time_window_seconds = time_window_hours * 3600
-    
-    time_buckets = {}
-    for point in points:
-        time_key = int(point['ts'] / time_window_seconds)  # Group by time window
-        # Keep the most recent point in each time window
-        if time_key not in time_buckets:
-            time_buckets[time_key] = point
-        elif point['ts'] > time_buckets[time_key]['ts']:
-            time_buckets[time_key] = point
-    
-    # Sort by timestamp and return
-    result = sorted(time_buckets.values(), key=lambda x: x['ts'])
-    return result
+    ts = [point['ts'] for point in points]
+    return [points[i] for i in _latest_index_per_window(ts, 0, len(ts), _dedup_window_seconds())]
 
 def get_signal_history(node_id: int, hours: int = None):
     """Alias for get_special_history() - returns battery, RSSI, SNR history for a node."""
@@ -11,7 +11,7 @@ import time
 
 from . import config
 from . import mqtt_handler as mh
-from .topics import gateway_id_from_topic
+from .topics import packet_gateway_id
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ def _record_gateway_connection(special_node_id, gateway_node_id, json_data, conf
         mh.nodes_data[gateway_node_id] = {}
     mh.nodes_data[gateway_node_id]["is_gateway"] = True
     mh.node_is_gateway[gateway_node_id] = True
-    logger.debug(f"Node {gateway_node_id} marked as gateway (received from special node {special_node_id}, confidence={confidence})")
+    logger.debug("Node %s marked as gateway (received from special node %s, confidence=%s)", gateway_node_id, special_node_id, confidence)
 
     # Get gateway info from mh.nodes_data AFTER ensuring it exists
     gateway_info = mh.nodes_data.get(gateway_node_id, {})
@@ -58,6 +58,7 @@ def _record_gateway_connection(special_node_id, gateway_node_id, json_data, conf
     
     # Store/update this gateway connection
     mh.special_node_gateways[special_node_id][gateway_node_id] = connection_info
+    mh.gateway_to_specials.setdefault(gateway_node_id, set()).add(special_node_id)
 
     # Update the gateway's own node_data with latest signal and timestamp
     mh.nodes_data[gateway_node_id]["last_seen"] = time.time()
@@ -97,9 +98,9 @@ def _record_gateway_connection(special_node_id, gateway_node_id, json_data, conf
             "snr": connection_info["snr"],
         }
         mh.nodes_data[special_node_id]["best_gateway_rssi"] = incoming_rssi
-        logger.debug(f"Best gateway updated for {special_node_id}: {gateway_node_id} ({connection_info['name']}) RSSI={incoming_rssi}dBm")
+        logger.debug("Best gateway updated for %s: %s (%s) RSSI=%sdBm", special_node_id, gateway_node_id, connection_info['name'], incoming_rssi)
     else:
-        logger.debug(f"Gateway connection: {special_node_id} → {gateway_node_id} ({connection_info['name']}) RSSI={incoming_rssi} (not best)")
+        logger.debug("Gateway connection: %s → %s (%s) RSSI=%s (not best)", special_node_id, gateway_node_id, connection_info['name'], incoming_rssi)
 
     # Update gateway reliability cache for this gateway
     _update_gateway_reliability_cache_for_gateway(gateway_node_id)
@@ -132,7 +133,7 @@ def _extract_gateway_from_packet(special_node_id, json_data):
     
     mqtt_topic = json_data.get("mqtt_topic")
     if not mqtt_topic:
-        logger.debug(f"Gateway extraction: No mqtt_topic in packet from {special_node_id}")
+        logger.debug("Gateway extraction: No mqtt_topic in packet from %s", special_node_id)
         return
     
     # Get hop data to determine if this is a direct reception
@@ -147,24 +148,24 @@ def _extract_gateway_from_packet(special_node_id, json_data):
     if not is_direct_hop:
         # Packet was relayed (hops consumed in transit)
         hops_traveled = (hop_start - hop_limit) if (hop_start is not None and hop_limit is not None) else None
-        logger.debug(f"Rejecting relayed packet: hop_start={hop_start}, hop_limit={hop_limit}, hops_traveled={hops_traveled} for special_node={special_node_id}")
+        logger.debug("Rejecting relayed packet: hop_start=%s, hop_limit=%s, hops_traveled=%s for special_node=%s", hop_start, hop_limit, hops_traveled, special_node_id)
         return
     
     # This is a legitimate direct reception (hop_start == hop_limit per Meshtastic spec)
-    logger.debug(f"Accepting direct reception: hop_start={hop_start}, hop_limit={hop_limit}, rssi={rx_rssi} for special_node={special_node_id}")
+    logger.debug("Accepting direct reception: hop_start=%s, hop_limit=%s, rssi=%s for special_node=%s", hop_start, hop_limit, rx_rssi, special_node_id)
     
     # Extract gateway node ID from MQTT topic
-    gateway_node_id = gateway_id_from_topic(mqtt_topic)
-    logger.debug(f"Gateway extraction: mqtt_topic={mqtt_topic}, extracted_id={gateway_node_id}, hop_start={hop_start}, hop_limit={hop_limit}, rssi={rx_rssi}")
+    gateway_node_id = packet_gateway_id(json_data)
+    logger.debug("Gateway extraction: mqtt_topic=%s, extracted_id=%s, hop_start=%s, hop_limit=%s, rssi=%s", mqtt_topic, gateway_node_id, hop_start, hop_limit, rx_rssi)
     if gateway_node_id:
         # Ensure first-hop receiver entry exists in mh.nodes_data
         if gateway_node_id not in mh.nodes_data:
             mh.nodes_data[gateway_node_id] = {}
         # Record the gateway as direct reception (only type we accept)
         _record_gateway_connection(special_node_id, gateway_node_id, json_data, confidence="direct")
-        logger.debug(f"Gateway detected: {gateway_node_id} received direct from special_node={special_node_id}")
+        logger.debug("Gateway detected: %s received direct from special_node=%s", gateway_node_id, special_node_id)
     else:
-        logger.debug(f"Failed to extract gateway node ID from topic: {mqtt_topic}")
+        logger.debug("Failed to extract gateway node ID from topic: %s", mqtt_topic)
 
 def _calculate_gateway_reliability_score(gateway_detections):
     """
@@ -236,17 +237,16 @@ def _update_gateway_reliability_cache_for_gateway(gateway_id):
         gateway_id: The gateway node ID to update cache for
     """
 
-    # Collect all detections of this gateway across all special nodes
+    # Collect all detections of this gateway across the special nodes it has heard
     # Also find the most recent gateway info
     all_detections = []
     most_recent_info = None
-    for special_id, connections in mh.special_node_gateways.items():
-        if gateway_id in connections:
-            gw_info = connections[gateway_id]
-            all_detections.append(gw_info)
-            # Keep the most recently seen gateway info
-            if most_recent_info is None or gw_info.get("last_seen", 0) > most_recent_info.get("last_seen", 0):
-                most_recent_info = gw_info
+    for special_id in mh.gateway_to_specials.get(gateway_id, ()):
+        gw_info = mh.special_node_gateways[special_id][gateway_id]
+        all_detections.append(gw_info)
+        # Keep the most recently seen gateway info
+        if most_recent_info is None or gw_info.get("last_seen", 0) > most_recent_info.get("last_seen", 0):
+            most_recent_info = gw_info
 
     # Calculate reliability score
     reliability = _calculate_gateway_reliability_score(all_detections)
@@ -267,7 +267,7 @@ def _update_gateway_reliability_cache_for_gateway(gateway_id):
     # Update gateway node IDs set
     mh.all_gateway_node_ids.add(gateway_id)
 
-    logger.debug(f"Updated gateway reliability cache for {gateway_id}: score={reliability['score']}, detections={reliability['detection_count']}")
+    logger.debug("Updated gateway reliability cache for %s: score=%s, detections=%s", gateway_id, reliability['score'], reliability['detection_count'])
 
 
 def _update_gateway_names_in_connections(node_id, updated_name):
@@ -284,7 +284,6 @@ def _update_gateway_names_in_connections(node_id, updated_name):
     if not updated_name or updated_name == "Unknown":
         return
 
-    for special_id, gw_dict in mh.special_node_gateways.items():
-        if node_id in gw_dict:
-            gw_dict[node_id]["name"] = updated_name
-            logger.debug(f'Updated gateway name in connection: {node_id} -> {updated_name}')
+    for special_id in mh.gateway_to_specials.get(node_id, ()):
+        mh.special_node_gateways[special_id][node_id]["name"] = updated_name
+        logger.debug('Updated gateway name in connection: %s -> %s', node_id, updated_name)
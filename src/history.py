@@ -0,0 +1,118 @@
+"""Special-node trail storage.
+
+special_history[node_id] is a HistoryRing: one array('d') column per field
+(ts, lat, lon, alt, voltage, rssi, snr) instead of one dict per point. A
+week of trail for a buoy is a few hundred points; as dicts each one cost a
+PyDict plus seven boxed floats, as columns it is seven machine doubles.
+
+Points are appended in time order. Missing values (no fix yet, no voltage
+sample) are stored as NaN and come back out as None. Because ts is sorted,
+pruning and "since" filtering are a bisect on the ts column. Pruning only
+advances the head index; the dead prefix is compacted away once it outgrows
+the live part, so both append and prune stay amortised cheap.
+
+The packet worker writes a ring while API threads read it, and one point is
+spread over seven columns, so every write and every multi-column read holds
+the ring's lock: readers that compute indices from ts and then fetch points
+with entry() must do both under one `with ring.lock:`.
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+
+FIELDS = ('ts', 'lat', 'lon', 'alt', 'voltage', 'rssi', 'snr')
+
+_NAN = float('nan')
+
+# Don't bother compacting tiny dead prefixes
+_COMPACT_MIN = 64
+
+
+def _pack(value):
+    return _NAN if value is None else value
+
+
+def _unpack(value):
+    return None if value != value else value
+
+
+class HistoryRing:
+    """Time-ordered trail of one special node, stored column-wise."""
+
+    __slots__ = FIELDS + ('head', 'lock')
+
+    def __init__(self):
+        for name in FIELDS:
+            setattr(self, name, array('d'))
+        self.head = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ts) - self.head
+
+    def append(self, ts, lat=None, lon=None, alt=None, voltage=None, rssi=None, snr=None):
+        with self.lock:
+            self.ts.append(ts)
+            self.lat.append(_pack(lat))
+            self.lon.append(_pack(lon))
+            self.alt.append(_pack(alt))
+            self.voltage.append(_pack(voltage))
+            self.rssi.append(_pack(rssi))
+            self.snr.append(_pack(snr))
+
+    def entry(self, i):
+        """Point at absolute column index i, as the dict shape the API serves.
+        Caller holds self.lock (or is the only writer)."""
+        return {
+            'ts': self.ts[i],
+            'lat': _unpack(self.lat[i]),
+            'lon': _unpack(self.lon[i]),
+            'alt': _unpack(self.alt[i]),
+            'voltage': _unpack(self.voltage[i]),
+            'rssi': _unpack(self.rssi[i]),
+            'snr': _unpack(self.snr[i]),
+        }
+
+    def index_of(self, ts):
+        """Absolute index of the first live point with timestamp >= ts.
+        Caller holds self.lock (or is the only writer)."""
+        # bisect works on the array directly (no copy); a memoryview would pin
+        # the buffer and make the next append raise BufferError
+        return bisect_left(self.ts, ts, self.head, len(self.ts))
+
+    def last(self):
+        """Most recent point as a dict, or None if empty."""
+        with self.lock:
+            return self.entry(len(self.ts) - 1) if len(self) else None
+
+    def last_ts(self):
+        with self.lock:
+            return self.ts[-1] if len(self) else None
+
+    def merge_last(self, rssi, snr, voltage):
+        """Fold a sample into the most recent point: keep the best (highest)
+        RSSI/SNR, replace voltage with the latest reading."""
+        with self.lock:
+            i = len(self.ts) - 1
+            if rssi is not None:
+                old = self.rssi[i]
+                if old != old or rssi > old:
+                    self.rssi[i] = rssi
+            if snr is not None:
+                old = self.snr[i]
+                if old != old or snr > old:
+                    self.snr[i] = snr
+            if voltage is not None:
+                self.voltage[i] = voltage
+
+    def prune_before(self, cutoff):
+        """Drop points older than cutoff (oldest first)."""
+        with self.lock:
+            n = len(self.ts)
+            head = self.index_of(cutoff)
+            self.head = head
+            if head >= _COMPACT_MIN and head * 2 >= n:
+                for name in FIELDS:
+                    del getattr(self, name)[:head]
+                self.head = 0
@@ -651,8 +651,7 @@ def get_special_history_batch() -> Response:
         trails = {}
 
         # Get history for all special nodes
-        for node_id in config.SPECIAL_NODE_IDS:
-            data = mqtt_handler.get_special_history(node_id, hours)
+        for node_id, data in mqtt_handler.get_all_special_history(hours).items():
             trails[str(node_id)] = {
                 'points': data,
                 'count': len(data)
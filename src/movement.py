@@ -19,7 +19,7 @@ from collections import defaultdict
 from . import alerts
 from . import config
 from . import storage
-from .topics import gateway_id_from_topic
+from .topics import packet_gateway_id
 
 logger = logging.getLogger(__name__)
 
@@ -161,7 +161,7 @@ def _add_copy_to_alert_buffer(node_id, json_data, payload, distance_m,
         'observed_lon': observed_lon,
         'signal_score': _get_signal_quality_score(json_data),
         'is_far': is_far,
-        'gateway_id': gateway_id_from_topic(topic) if topic else None,
+        'gateway_id': packet_gateway_id(json_data),
         'mqtt_topic': topic,
         'hop_start': json_data.get('hop_start'),
         'hop_limit': json_data.get('hop_limit'),
@@ -249,7 +249,7 @@ def _evaluate_alert_buffer(node_id, info):
                 'movement_muted', node_id, distance_m=best_rep['distance_m'],
                 details={'packet_id': best_pid, 'consensus': csize, 'dissent': dsize},
                 simulated=_sim)
-        elif getattr(config, 'ALERT_ENABLED', False):
+        elif config.ALERT_ENABLED:
             storage.record_alert_event(
                 'movement_fired', node_id, distance_m=best_rep['distance_m'],
                 details={'packet_id': best_pid, 'consensus': csize, 'dissent': dsize,
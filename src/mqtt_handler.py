@@ -7,25 +7,30 @@ Tracks node positions, names, and last seen timestamps.
 
 import paho.mqtt.client as mqtt_client
 import base64
+import sys
 import time
 import logging
 import json
 import threading
+import queue
 from collections import deque
 from pathlib import Path
 import os
 import math
-from cryptography.hazmat.backends import default_backend
+from functools import lru_cache
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from google.protobuf.json_format import MessageToJson
 
 # Import Meshtastic protobuf definitions
 from meshtastic import mesh_pb2, mqtt_pb2, portnums_pb2, telemetry_pb2
+from google.protobuf.internal import api_implementation
 
 from . import config
 from . import alerts
 from . import storage
-from .topics import sanitize_display_text, channel_from_topic, gateway_id_from_topic
+from .history import HistoryRing
+from .protodict import message_to_dict
+from .topics import (sanitize_display_text, channel_from_topic, gateway_id_from_topic,
+                     parse_topic, packet_gateway_id)
 from .movement import (
     _haversine_m,
     _get_signal_quality_score,
@@ -55,24 +60,28 @@ nodes_data = {}
 # Track if we've received any messages (more reliable than client.is_connected())
 message_received = False
 packets_received = False  # Track when we've received actual MQTT packets with data
+# Both are time.monotonic_ns() stamps (0 = never): only ever compared against
+# each other / "now" for staleness, so a wall-clock step can't fake an outage
 last_message_time = 0
-last_packet_time = 0  # Timestamp of last received MQTT packet (for detecting stale connections)
+last_packet_time = 0  # Last received MQTT packet (for detecting stale connections)
 
 # Staleness thresholds - different for all-nodes vs special-nodes-only mode
 PACKET_STALENESS_THRESHOLD_ALL_NODES = 300      # 5 minutes - when subscribed to all nodes
 PACKET_STALENESS_THRESHOLD_SPECIAL_ONLY = 3600  # 60 minutes - when subscribed to special nodes only
+# Threshold for the current subscription mode; None = recompute on next is_connected()
+_staleness_threshold = None
 
-# Special nodes history: node_id -> deque of {ts, lat, lon, alt}
+# Special nodes history: node_id -> HistoryRing (columns ts, lat, lon, alt, voltage, rssi, snr)
 special_history = {}
 
 # Store MQTT topic per node to extract channel name
 node_topics = {}
 
-# Special nodes packet tracking: store ALL packets for special nodes (no limit)
-special_node_packets = {}  # node_id -> list of ALL packets with details
+# Special nodes packet tracking: most recent packets per special node, deduped by packet id
+special_node_packets = {}  # node_id -> deque(maxlen=_SPECIAL_NODE_PACKETS_MAX) of packet details
+_SPECIAL_NODE_PACKETS_MAX = 500
 special_node_last_packet = {}  # node_id -> timestamp of last packet (any type, even encrypted)
 special_node_channels = {}  # node_id -> channel_name from topic (for routing packets)
-special_node_position_timestamps = {}  # node_id -> set of rxTime values (legacy; kept for restart clears)
 
 # Lean storage (v2.1): one history entry + one DB row per BROADCAST, not per
 # gateway copy. A broadcast's gateway copies share the packet id; ~20-25
@@ -108,6 +117,11 @@ node_is_gateway = {}  # node_id -> bool (True if node is a gateway)
 # Tracks which gateways received packets from which special nodes
 special_node_gateways = {}
 
+# Reverse index of special_node_gateways: gateway_node_id -> set of special_node_ids
+# that gateway has heard. Maintained by gateways._record_gateway_connection, so a
+# gateway update touches only its own connection records instead of every special node.
+gateway_to_specials = {}
+
 # Gateway reliability cache: gateway_id -> {score, detection_count, avg_rssi, last_updated}
 # Updated when gateway connections change, used by get_nodes() for O(1) lookup
 gateway_reliability_cache = {}
@@ -120,9 +134,41 @@ all_gateway_node_ids = set()
 # Stores most recent gateway info across all special nodes for quick lookup
 gateway_info_cache = {}
 
-def _is_special_node(node_id):
-    """Check if a node_id is in the special nodes list. All special nodes are power-sensor buoys."""
-    return node_id in config.SPECIAL_NODES
+# Config values read per packet, bound once instead of getattr(config, ...) each time:
+# - _SPECIAL_NODE_CONFIG: node_id -> {label, home_lat, home_lon, voltage_channel, ...}
+# - _is_special_node(node_id): is node_id a special node? All special nodes are power-sensor buoys.
+# - _SPECIAL_HISTORY_SECS: trail retention window
+# - _CHANNEL_KEY: decoded AES key for encrypted packets (None if MQTT_KEY is invalid)
+# Only values that change on config reload belong here; update_special_nodes()
+# reloads config (which rebinds config.SPECIAL_NODES), so it re-runs
+# _refresh_config_cache() afterwards. Settings that main._apply_setting mutates
+# at runtime (movement threshold, alert toggle, ...) are read as config.X instead.
+def _decode_channel_key(key_str):
+    """Channel key bytes from the configured base64 key ('AQ==' = default public key)."""
+    if key_str == 'AQ==':
+        key_str = '1PG7OiApB1nwvP+rz05pAQ=='
+
+    # Decode and pad base64 key
+    padded_key = key_str.ljust(len(key_str) + ((4 - (len(key_str) % 4)) % 4), '=')
+    replaced_key = padded_key.replace('-', '+').replace('_', '/')
+    try:
+        return base64.b64decode(replaced_key.encode('ascii'))
+    except Exception as e:
+        logger.error(f"Error decoding encryption key: {e}")
+        return None
+
+
+def _refresh_config_cache():
+    """Rebind the cached config values to the current config module state."""
+    global _SPECIAL_NODE_CONFIG, _is_special_node, _SPECIAL_HISTORY_SECS, _CHANNEL_KEY
+    _SPECIAL_NODE_CONFIG = getattr(config, 'SPECIAL_NODES', {})
+    _is_special_node = _SPECIAL_NODE_CONFIG.__contains__
+    _SPECIAL_HISTORY_SECS = getattr(config, 'SPECIAL_HISTORY_HOURS', 24) * 3600
+    _CHANNEL_KEY = _decode_channel_key(getattr(config, 'MQTT_KEY', 'AQ=='))
+
+
+_refresh_config_cache()
+
 
 def _get_node_voltage(node_id):
     """
@@ -146,8 +192,9 @@ def _get_node_voltage(node_id):
 
     # Get voltage channel from config (defaults to 'ch3_voltage' for power sensors, 'device_voltage' for others)
     voltage_channel = 'device_voltage'  # Default for non-special nodes
-    if node_id in config.SPECIAL_NODES:
-        voltage_channel = config.SPECIAL_NODES[node_id].get('voltage_channel', 'device_voltage')
+    cfg = _SPECIAL_NODE_CONFIG.get(node_id)
+    if cfg is not None:
+        voltage_channel = cfg.get('voltage_channel', 'device_voltage')
 
     # Get voltage from the configured channel ONLY
     # No fallbacks - if the configured source isn't available, return None
@@ -193,38 +240,7 @@ def _get_voltage_for_history(node_id):
     """Get latest voltage for a special node, used as the canonical history sample."""
     return _get_node_voltage(node_id)
 
-def _find_recent_history_entry(node_id, current_ts, window_seconds=2):
-    """
-    Find the most recent history entry within a time window.
-
-    Args:
-        node_id: Node ID to search history for
-        current_ts: Current timestamp
-        window_seconds: Time window in seconds (default: 2)
-
-    Returns:
-        Most recent history entry dict if found within window, else None
-    """
-    if node_id not in special_history or len(special_history[node_id]) == 0:
-        return None
-
-    most_recent = special_history[node_id][-1]
-    if abs(most_recent['ts'] - current_ts) < window_seconds:
-        return most_recent
-    return None
-
-def _update_history_entry(entry, rssi, snr, voltage):
-    """Update an existing history entry. Keeps the best (highest) RSSI/SNR; replaces voltage with the latest sample."""
-    if rssi is not None and (entry.get('rssi') is None or rssi > entry['rssi']):
-        entry['rssi'] = rssi
-
-    if snr is not None and (entry.get('snr') is None or snr > entry['snr']):
-        entry['snr'] = snr
-
-    if voltage is not None:
-        entry['voltage'] = voltage
-
-def _add_telemetry_to_history(node_id, json_data):
+def _add_telemetry_to_history(node_id, json_data, now=None):
     """
     Add or update telemetry data in special node history.
     Creates new history entry or updates existing one if within 2-second window.
@@ -239,6 +255,7 @@ def _add_telemetry_to_history(node_id, json_data):
     Args:
         node_id: Node ID to add history for
         json_data: Full MQTT packet data
+        now: Packet receive time (defaults to time.time())
     """
     # Guard clause: Not a special node? Skip.
     if not _is_special_node(node_id):
@@ -252,28 +269,23 @@ def _add_telemetry_to_history(node_id, json_data):
     # Ensure history structure exists
     _ensure_history_struct(node_id)
 
-    current_ts = time.time()
+    current_ts = now if now is not None else time.time()
     voltage = _get_voltage_for_history(node_id)
     rssi = json_data.get("rx_rssi")
     snr = json_data.get("rx_snr")
 
-    recent_entry = _find_recent_history_entry(node_id, current_ts)
+    ring = special_history[node_id]
+    last_ts = ring.last_ts()
 
-    if recent_entry:
-        _update_history_entry(recent_entry, rssi, snr, voltage)
-        logger.debug(f'Updated telemetry history for {node_id}: voltage={recent_entry.get("voltage")}, rssi={recent_entry["rssi"]}, snr={recent_entry["snr"]}')
+    # Merge into the latest point if it is within the 2-second window
+    if last_ts is not None and abs(last_ts - current_ts) < 2:
+        ring.merge_last(rssi, snr, voltage)
+        if logger.isEnabledFor(logging.DEBUG):
+            recent_entry = ring.last()
+            logger.debug('Updated telemetry history for %s: voltage=%s, rssi=%s, snr=%s', node_id, recent_entry["voltage"], recent_entry["rssi"], recent_entry["snr"])
     else:
-        entry = {
-            "ts": current_ts,
-            "lat": lat,
-            "lon": lon,
-            "alt": nodes_data[node_id].get("alt", 0),
-            "voltage": voltage,
-            "rssi": rssi,
-            "snr": snr,
-        }
-        special_history[node_id].append(entry)
-        logger.debug(f'Added telemetry to history for {node_id}: voltage={entry["voltage"]}, rssi={entry["rssi"]}, snr={entry["snr"]}')
+        ring.append(current_ts, lat, lon, nodes_data[node_id].get("alt", 0), voltage, rssi, snr)
+        logger.debug('Added telemetry to history for %s: voltage=%s, rssi=%s, snr=%s', node_id, voltage, rssi, snr)
 
     # Prune old history entries
     _prune_history(node_id, now_ts=current_ts)
@@ -308,11 +320,10 @@ def rebuild_history_from_db():
         if not rows:
             continue
         _ensure_history_struct(node_id)
+        ring = special_history[node_id]
         for r in rows:
-            special_history[node_id].append({
-                'ts': r['ts'], 'lat': r['lat'], 'lon': r['lon'], 'alt': r['alt'],
-                'voltage': r.get('voltage'), 'rssi': r['rssi'], 'snr': r['snr'],
-            })
+            ring.append(r['ts'], r['lat'], r['lon'], r['alt'],
+                        r.get('voltage'), r['rssi'], r['snr'])
         total += len(rows)
     if total:
         logger.info(f'Rebuilt {total} trail point(s) from durable store ({hours}h window)')
@@ -330,7 +341,7 @@ def rebuild_history_from_db():
         if not st:
             continue
         nd = nodes_data.setdefault(node_id, {})
-        sn = config.SPECIAL_NODES.get(node_id, {})
+        sn = _SPECIAL_NODE_CONFIG.get(node_id, {})
         if sn.get('home_lat') is not None:
             nd.setdefault('origin_lat', sn['home_lat'])
             nd.setdefault('origin_lon', sn['home_lon'])
@@ -345,7 +356,7 @@ def rebuild_history_from_db():
                 if dist is not None:
                     nd.setdefault('distance_from_origin_m', dist)
                     nd.setdefault('moved_far', bool(
-                        dist >= getattr(config, 'SPECIAL_MOVEMENT_THRESHOLD_METERS', 50.0)))
+                        dist >= config.SPECIAL_MOVEMENT_THRESHOLD_METERS))
         if st.get('tel_ts'):
             nd.setdefault('voltage', st['voltage'])
             nd.setdefault('battery_pct', st['battery_pct'])
@@ -363,29 +374,23 @@ def rebuild_history_from_db():
         logger.info(f'Warm-started last-known state for {warmed} special node(s)')
 
 
-def _append_position_history(node_id, lat, lon, alt, json_data):
+def _append_position_history(node_id, lat, lon, alt, json_data, now=None):
     """Append one accepted position to the in-memory trail and the durable store."""
     _ensure_history_struct(node_id)
-    entry = {
-        "ts": time.time(),
-        "lat": lat,
-        "lon": lon,
-        "alt": alt,
-        "voltage": _get_node_voltage(node_id),
-        "rssi": json_data.get("rx_rssi"),
-        "snr": json_data.get("rx_snr"),
-    }
-    special_history[node_id].append(entry)
-    _prune_history(node_id, now_ts=entry['ts'])
+    ts = now if now is not None else time.time()
+    voltage = _get_node_voltage(node_id)
+    rssi = json_data.get("rx_rssi")
+    snr = json_data.get("rx_snr")
+    special_history[node_id].append(ts, lat, lon, alt, voltage, rssi, snr)
+    _prune_history(node_id, now_ts=ts)
 
     try:
-        topic = json_data.get('mqtt_topic')
         storage.record_position(
-            node_id, entry['ts'], lat, lon, alt=alt, voltage=entry['voltage'],
+            node_id, ts, lat, lon, alt=alt, voltage=voltage,
             distance_from_home_m=nodes_data.get(node_id, {}).get('distance_from_origin_m'),
             packet_id=json_data.get('id'),
-            gateway_id=_extract_gateway_node_id_from_topic(topic) if topic else None,
-            rssi=entry['rssi'], snr=entry['snr'],
+            gateway_id=packet_gateway_id(json_data),
+            rssi=rssi, snr=snr,
             simulated=bool(json_data.get('simulated')),
         )
     except Exception as db_err:
@@ -406,7 +411,7 @@ def _check_battery_alert(node_id, simulated=False):
         alerts.send_battery_alert(node_id, nodes_data[node_id])
 
 # Track best packets by ID for deduplication
-_packet_id_tracking = {}  # {node_id: {packet_id: {best_packet_info, stored_index}}}
+_packet_id_tracking = {}  # {node_id: {packet_id: {packet, signal_score}}} for packets still in special_node_packets
 
 
 def _build_packet_info(node_id, packet_type, json_data, current_time):
@@ -464,7 +469,7 @@ def _build_packet_info(node_id, packet_type, json_data, current_time):
     
     return packet_info
 
-def _track_special_node_packet(node_id, packet_type, json_data):
+def _track_special_node_packet(node_id, packet_type, json_data, now=None):
     """Track all packets from special nodes with deduplication by packet ID.
     
     When same packet ID seen multiple times:
@@ -478,67 +483,67 @@ def _track_special_node_packet(node_id, packet_type, json_data):
         return
     
     # Ensure tracking dicts exist for this node
-    if node_id not in special_node_packets:
-        special_node_packets[node_id] = []
-    if node_id not in _packet_id_tracking:
-        _packet_id_tracking[node_id] = {}
+    packets = special_node_packets.get(node_id)
+    if packets is None:
+        packets = special_node_packets[node_id] = deque(maxlen=_SPECIAL_NODE_PACKETS_MAX)
+    tracking = _packet_id_tracking.get(node_id)
+    if tracking is None:
+        tracking = _packet_id_tracking[node_id] = {}
     
     # Get packet ID for deduplication
     packet_id = json_data.get('id')
     if not packet_id:
-        logger.debug(f'Packet missing ID field, skipping dedup: {packet_type}')
+        logger.debug('Packet missing ID field, skipping dedup: %s', packet_type)
         return
     
     # Log hop info for diagnostic purposes
     hop_start = json_data.get('hop_start')
     hop_limit = json_data.get('hop_limit')
     hops_traveled = (hop_start - hop_limit) if (hop_start is not None and hop_limit is not None) else None
-    logger.info(f'📦 PACKET HOP INFO: {config.SPECIAL_NODES.get(node_id, node_id)} - {packet_type} - hop_start={hop_start}, hop_limit={hop_limit}, hops_traveled={hops_traveled}')
+    logger.info(f'📦 PACKET HOP INFO: {_SPECIAL_NODE_CONFIG.get(node_id, node_id)} - {packet_type} - hop_start={hop_start}, hop_limit={hop_limit}, hops_traveled={hops_traveled}')
     
-    current_time = time.time()
+    current_time = now if now is not None else time.time()
     new_signal_score = _get_signal_quality_score(json_data)
     
     # Check if we've seen this packet ID before
-    if packet_id in _packet_id_tracking[node_id]:
-        old_info = _packet_id_tracking[node_id][packet_id]
-        old_index = old_info.get('stored_index')
+    old_info = tracking.get(packet_id)
+    if old_info is not None:
+        old_packet = old_info['packet']
         
         # Get old packet's signal score
-        if old_index is not None and old_index < len(special_node_packets[node_id]):
-            old_packet = special_node_packets[node_id][old_index]
-            old_signal_data = {
-                'hop_start': old_packet.get('hop_start'),
-                'hop_limit': old_packet.get('hop_limit'),
-                'rx_snr': old_packet.get('rx_snr'),
-                'rx_rssi': old_packet.get('rx_rssi')
-            }
-            old_signal_score = _get_signal_quality_score(old_signal_data)
-        else:
-            old_signal_score = 0
+        old_signal_data = {
+            'hop_start': old_packet.get('hop_start'),
+            'hop_limit': old_packet.get('hop_limit'),
+            'rx_snr': old_packet.get('rx_snr'),
+            'rx_rssi': old_packet.get('rx_rssi')
+        }
+        old_signal_score = _get_signal_quality_score(old_signal_data)
         
         # Keep new packet only if it has better signal quality
         if new_signal_score > old_signal_score:
-            logger.debug(f'Packet {packet_id}: Replacing old (score {old_signal_score}) with new (score {new_signal_score})')
-            # Update the existing packet info in-place
-            if old_index is not None and old_index < len(special_node_packets[node_id]):
-                special_node_packets[node_id][old_index] = _build_packet_info(node_id, packet_type, json_data, current_time)
+            logger.debug('Packet %s: Replacing old (score %s) with new (score %s)', packet_id, old_signal_score, new_signal_score)
+            # Update the existing packet info in-place (keeps its place in the deque)
+            old_packet.clear()
+            old_packet.update(_build_packet_info(node_id, packet_type, json_data, current_time))
         else:
-            logger.debug(f'Packet {packet_id}: Keeping old (score {old_signal_score}) over new (score {new_signal_score})')
+            logger.debug('Packet %s: Keeping old (score %s) over new (score %s)', packet_id, old_signal_score, new_signal_score)
             return  # Don't process further, keep old packet
     else:
         # New packet ID - add it
-        logger.debug(f'Packet {packet_id}: New packet, adding (score {new_signal_score})')
-        stored_index = len(special_node_packets[node_id])
+        logger.debug('Packet %s: New packet, adding (score %s)', packet_id, new_signal_score)
+        if len(packets) == _SPECIAL_NODE_PACKETS_MAX:
+            # The append below evicts the oldest packet; forget its id with it
+            tracking.pop(packets[0].get('id'), None)
         packet_info = _build_packet_info(node_id, packet_type, json_data, current_time)
-        special_node_packets[node_id].append(packet_info)
-        _packet_id_tracking[node_id][packet_id] = {'stored_index': stored_index, 'signal_score': new_signal_score}
+        packets.append(packet_info)
+        tracking[packet_id] = {'packet': packet_info, 'signal_score': new_signal_score}
     
     # Extract gateway info AFTER dedup, using the best-signal copy
     if _is_special_node(node_id):
         _extract_gateway_from_packet(node_id, json_data)
     
     # Log special node packet arrival
-    logger.info(f'SPECIAL NODE PACKET: {config.SPECIAL_NODES.get(node_id, node_id)} - {packet_type} (ID: {packet_id}, score: {new_signal_score})')
+    logger.info(f'SPECIAL NODE PACKET: {_SPECIAL_NODE_CONFIG.get(node_id, node_id)} - {packet_type} (ID: {packet_id}, score: {new_signal_score})')
 
 
 # Note: All packet decryption and protobuf parsing is handled automatically
@@ -547,8 +552,8 @@ def _track_special_node_packet(node_id, packet_type, json_data):
 
 def _ensure_history_struct(node_id):
     if node_id not in special_history:
-        # unbounded deque; prune by time on append
-        special_history[node_id] = deque()
+        # unbounded; prune by time on append
+        special_history[node_id] = HistoryRing()
 
 
 def _prune_history(node_id, now_ts=None):
@@ -557,11 +562,12 @@ def _prune_history(node_id, now_ts=None):
         return
     if now_ts is None:
         now_ts = time.time()
-    cutoff = now_ts - (config.SPECIAL_HISTORY_HOURS * 3600)
-    dq = special_history[node_id]
-    # pop from left while too old (oldest first)
-    while dq and dq[0]['ts'] < cutoff:
-        dq.popleft()
+    cutoff = now_ts - _SPECIAL_HISTORY_SECS
+    special_history[node_id].prune_before(cutoff)
+
+
+# Name fields probed in priority order by _extract_node_name_from_payload
+_NAME_KEYS = ("longName", "longname", "long_name", "name", "deviceName", "displayName")
 
 
 def _extract_node_name_from_payload(payload):
@@ -577,15 +583,15 @@ def _extract_node_name_from_payload(payload):
     # dict-like payloads
     if isinstance(payload, dict):
         # Try common name fields first
-        for k in ("longName", "longname", "long_name", "name", "deviceName", "displayName"):
+        for k in _NAME_KEYS:
             v = payload.get(k)
-            if isinstance(v, str) and v.strip():
-                return v.strip()
+            if type(v) is str:
+                v = v.strip()
+                if v:
+                    return v
         # Search nested values for a likely name
-        for v in payload.values():
-            if isinstance(v, str) and len(v.strip()) > 1 and any(c.isalpha() for c in v):
-                return v.strip()
-        return None
+        return next((v.strip() for v in payload.values()
+                     if type(v) is str and len(v.strip()) > 1 and any(map(str.isalpha, v))), None)
 
     # string payloads: try JSON decode, fallback to simple parse
     if isinstance(payload, str):
@@ -600,19 +606,28 @@ def _extract_node_name_from_payload(payload):
     return None
 
 
+# Keys _extract_modem_preset looks at: direct preset fields, then nested config dicts
+_PRESET_KEYS = ("modemPreset", "modem_preset", "loraModemPreset", "preset")
+_PRESET_CONTAINER_KEYS = ("lora", "radio", "channel", "channelConfig", "deviceConfig", "moduleConfig")
+_PRESET_KEYS_ANY = frozenset(_PRESET_KEYS + _PRESET_CONTAINER_KEYS)
+
+
 def _extract_modem_preset(obj):
     """Try to extract a human-friendly modem preset name from diverse payload shapes.
     Returns a string like 'Medium Slow' or None if not found.
     """
     try:
         if isinstance(obj, dict):
+            # Nodeinfo payloads almost never carry a preset; skip the walk
+            if not (obj.keys() & _PRESET_KEYS_ANY):
+                return None
             # Common keys that might carry preset
-            for k in ("modemPreset", "modem_preset", "loraModemPreset", "preset"):
+            for k in _PRESET_KEYS:
                 v = obj.get(k)
                 if isinstance(v, str) and v.strip():
                     return v.strip()
             # Sometimes nested under configs
-            for k in ("lora", "radio", "channel", "channelConfig", "deviceConfig", "moduleConfig"):
+            for k in _PRESET_CONTAINER_KEYS:
                 sub = obj.get(k)
                 if isinstance(sub, dict):
                     val = _extract_modem_preset(sub)
@@ -655,7 +670,7 @@ def _initialize_special_node_home_position(node_id):
         node_id: Special node ID to initialize
     """
     if "latitude" not in nodes_data[node_id] or nodes_data[node_id].get("latitude") is None:
-        special_node_config = getattr(config, 'SPECIAL_NODES', {}).get(node_id, {})
+        special_node_config = _SPECIAL_NODE_CONFIG.get(node_id, {})
         home_lat = special_node_config.get('home_lat')
         home_lon = special_node_config.get('home_lon')
         if home_lat is not None and home_lon is not None:
@@ -663,7 +678,7 @@ def _initialize_special_node_home_position(node_id):
             nodes_data[node_id]["longitude"] = home_lon
             nodes_data[node_id]["origin_lat"] = home_lat
             nodes_data[node_id]["origin_lon"] = home_lon
-            logger.debug(f'Initialized {node_id} position from home: {home_lat:.4f}, {home_lon:.4f}')
+            logger.debug('Initialized %s position from home: %.4f, %.4f', node_id, home_lat, home_lon)
 
 
 def _store_node_names(node_id, payload, extracted_name):
@@ -694,76 +709,91 @@ def _store_node_names(node_id, payload, extracted_name):
         nodes_data[node_id]["hw_model"] = "Unknown"
 
 
-def on_nodeinfo(json_data):
-    """Process node info messages - update node names."""
+def _mark_message_received():
+    """Record that the MQTT feed is alive (read by is_connected and /health)."""
     global message_received, last_message_time
     message_received = True
-    last_message_time = time.time()
-    
+    last_message_time = time.monotonic_ns()
+
+
+def _packet_context(json_data, node_id, packet_type, now):
+    """
+    Shared handler preamble: resolve channel name and special-node status.
+
+    For special nodes the packet is tracked and saved IMMEDIATELY, before any
+    processing that might fail, so packet data is never lost to a later error.
+    Callers have already dropped packets without a sender (node_id).
+
+    Returns:
+        tuple: (channel_name, is_special)
+    """
+    # Try our topic mapping first, then what the packet carries (usually "Unknown")
+    channel_name = _extract_channel_from_topic(node_id)
+    if channel_name == "Unknown":
+        channel_name = json_data.get("channel_name", "Unknown")
+
+    is_special = _is_special_node(node_id)
+    if is_special:
+        special_node_last_packet[node_id] = now
+        if special_node_channels.get(node_id) != channel_name:
+            special_node_channels[node_id] = channel_name
+        _track_special_node_packet(node_id, packet_type, json_data, now=now)
+
+    return channel_name, is_special
+
+
+def on_nodeinfo(json_data):
+    """Process node info messages - update node names."""
+    now = time.time()
+    _mark_message_received()
+
     try:
-        logger.debug(f'on_nodeinfo callback fired - processing message')
-        node_id = json_data.get("from")
+        logger.debug('on_nodeinfo callback fired - processing message')
         channel = json_data.get("channel")
         payload = json_data["decoded"]["payload"]
+        node_id = json_data.get("from")
+        if not node_id:
+            return
+        channel_name, is_special = _packet_context(json_data, node_id, 'NODEINFO_APP', now)
 
-        # Extract channel name once
-        channel_name = _extract_channel_from_topic(node_id) if node_id else "Unknown"
-        if channel_name == "Unknown":
-            channel_name = json_data.get("channel_name", "Unknown")
-
-        # Check if special node once
-        is_special = _is_special_node(node_id) if node_id else False
-
-        # IMPORTANT: Track and save packet IMMEDIATELY, before any processing that might fail
-        # This ensures we never lose packet data due to processing errors
+        role = payload.get("role") if isinstance(payload, dict) else None
+        
+        nd = nodes_data.setdefault(node_id, {})
+        
+        if channel is not None:
+            nd["channel"] = channel
+        if role:
+            nd["role"] = role
+        
+        # For special nodes: initialize position from home if not yet set
         if is_special:
-            special_node_last_packet[node_id] = time.time()
-            # Update channel name if different
-            if special_node_channels.get(node_id) != channel_name:
-                special_node_channels[node_id] = channel_name
-            # Track packet FIRST, before any other processing
-            _track_special_node_packet(node_id, 'NODEINFO_APP', json_data)
+            _initialize_special_node_home_position(node_id)
         
-        role = payload.get("role") if isinstance(payload, dict) else None
+        # Store channel name from topic
+        nd["channel_name"] = channel_name
         
-        if node_id:
-            if node_id not in nodes_data:
-                nodes_data[node_id] = {}
-            
-            if channel is not None:
-                nodes_data[node_id]["channel"] = channel
-            if role:
-                nodes_data[node_id]["role"] = role
-            
-            # For special nodes: initialize position from home if not yet set
-            if is_special:
-                _initialize_special_node_home_position(node_id)
-            
-            # Store channel name from topic
-            nodes_data[node_id]["channel_name"] = channel_name
-            
-            # Try to capture modem preset if present (though unlikely to be in packets)
-            preset = _extract_modem_preset(payload)
-            if preset:
-                nodes_data[node_id]["modem_preset"] = preset
-            
-            # Extract and store node name information
-            name = _extract_node_name_from_payload(payload)
-            _store_node_names(node_id, payload, name)
-            nodes_data[node_id]["last_seen"] = time.time()
-            
-            # Best RSSI/SNR within a rolling window — same helper on_position uses.
-            _update_best_signal(node_id, json_data)
-            
-            logger.info(f'Updated nodeinfo for {node_id}: {nodes_data[node_id]["long_name"]}')
+        # Try to capture modem preset if present (though unlikely to be in packets)
+        preset = _extract_modem_preset(payload)
+        if preset:
+            nd["modem_preset"] = preset
+        
+        # Extract and store node name information
+        name = _extract_node_name_from_payload(payload)
+        _store_node_names(node_id, payload, name)
+        nd["last_seen"] = now
+        
+        # Best RSSI/SNR within a rolling window — same helper on_position uses.
+        _update_best_signal(node_id, json_data, now)
+        
+        logger.info(f'Updated nodeinfo for {node_id}: {nd["long_name"]}')
 
-            # If this node is a gateway, update its name in all gateway connections and cache
-            updated_name = nodes_data[node_id].get("long_name")
-            _update_gateway_names_in_connections(node_id, updated_name)
+        # If this node is a gateway, update its name in all gateway connections and cache
+        updated_name = nd.get("long_name")
+        _update_gateway_names_in_connections(node_id, updated_name)
 
-            # Also update gateway info cache if this is a gateway
-            if node_is_gateway.get(node_id, False) and node_id in gateway_info_cache:
-                gateway_info_cache[node_id]["name"] = updated_name
+        # Also update gateway info cache if this is a gateway
+        if node_is_gateway.get(node_id, False) and node_id in gateway_info_cache:
+            gateway_info_cache[node_id]["name"] = updated_name
 
     except Exception as e:
         logger.error(f'❌ Error processing nodeinfo: {e}', exc_info=True)
@@ -778,7 +808,7 @@ def _process_special_movement(node_id, payload, json_data):
         lat = payload["latitude_i"] / 1e7
         lon = payload["longitude_i"] / 1e7
 
-        special_node_config = getattr(config, 'SPECIAL_NODES', {}).get(node_id, {})
+        special_node_config = _SPECIAL_NODE_CONFIG.get(node_id, {})
         home_lat = special_node_config.get('home_lat')
         home_lon = special_node_config.get('home_lon')
         if home_lat is not None and home_lon is not None:
@@ -794,7 +824,7 @@ def _process_special_movement(node_id, payload, json_data):
             return
         dist = _haversine_m(o_lat, o_lon, lat, lon)
         nodes_data[node_id]["distance_from_origin_m"] = dist
-        threshold_m = getattr(config, 'SPECIAL_MOVEMENT_THRESHOLD_METERS', 50.0)
+        threshold_m = config.SPECIAL_MOVEMENT_THRESHOLD_METERS
         moved_far = bool(dist is not None and dist >= threshold_m)
 
         try:
@@ -815,117 +845,108 @@ def _process_special_movement(node_id, payload, json_data):
 
         nodes_data[node_id]["moved_far"] = moved_far
     except Exception as e:
-        logger.debug(f"Error processing movement alerts for {node_id}: {e}")
+        logger.debug("Error processing movement alerts for %s: %s", node_id, e)
 
 
-def _update_node_position(node_id, payload):
+def _update_node_position(node_id, payload, now):
     """Write the decoded coordinates and freshness timestamps. Returns (lat, lon, alt)."""
+    nd = nodes_data[node_id]
     lat = payload["latitude_i"] / 1e7
     lon = payload["longitude_i"] / 1e7
     alt = payload.get("altitude", 0)
-    nodes_data[node_id]["latitude"] = lat
-    nodes_data[node_id]["longitude"] = lon
-    nodes_data[node_id]["altitude"] = alt
-    nodes_data[node_id]["last_seen"] = time.time()
-    nodes_data[node_id]["last_position_update"] = time.time()
+    nd["latitude"] = lat
+    nd["longitude"] = lon
+    nd["altitude"] = alt
+    nd["last_seen"] = now
+    nd["last_position_update"] = now
     return lat, lon, alt
 
 
-def _update_best_signal(node_id, json_data):
+def _update_best_signal(node_id, json_data, now):
     """Keep the best RSSI/SNR seen in a rolling 1-hour window (gateway copies
     arrive with varying signal; last-received would be arbitrary). Used
     internally by gateway scoring; not displayed since v2.0."""
+    nd = nodes_data[node_id]
     _SIGNAL_WINDOW = 3600
-    now_sig = time.time()
     for field, ts_field in (("rx_rssi", "rx_rssi_ts"), ("rx_snr", "rx_snr_ts")):
         new_val = json_data.get(field)
         if new_val is None:
             continue
-        prev = nodes_data[node_id].get(field)
-        prev_age = now_sig - nodes_data[node_id].get(ts_field, 0)
+        prev = nd.get(field)
+        prev_age = now - nd.get(ts_field, 0)
         if prev is None or prev_age > _SIGNAL_WINDOW or new_val > prev:
-            nodes_data[node_id][field] = new_val
-            nodes_data[node_id][ts_field] = now_sig
+            nd[field] = new_val
+            nd[ts_field] = now
 
 
-def _sync_gateway_position(node_id, lat, lon):
+def _sync_gateway_position(node_id, lat, lon, now):
     """When a gateway reports its own position, refresh it in every special
     node's connection record and in the gateway info cache."""
     if not node_is_gateway.get(node_id, False):
         return
-    for special_id, gw_dict in special_node_gateways.items():
-        if node_id in gw_dict:
-            gw_dict[node_id]["lat"] = lat
-            gw_dict[node_id]["lon"] = lon
-            gw_dict[node_id]["last_seen"] = time.time()
-    if node_id in gateway_info_cache:
-        gateway_info_cache[node_id]["lat"] = lat
-        gateway_info_cache[node_id]["lon"] = lon
-
-
-def _record_special_position(node_id, lat, lon, alt, json_data):
+    for special_id in gateway_to_specials.get(node_id, ()):
+        gw = special_node_gateways[special_id][node_id]
+        gw["lat"] = lat
+        gw["lon"] = lon
+        gw["last_seen"] = now
+    cached = gateway_info_cache.get(node_id)
+    if cached is not None:
+        cached["lat"] = lat
+        cached["lon"] = lon
+
+
+def _record_special_position(node_id, lat, lon, alt, json_data, now):
     """One history entry + one DB row per broadcast (lean storage)."""
     pid = json_data.get('id')
     if _is_new_broadcast(node_id, pid):
-        _append_position_history(node_id, lat, lon, alt, json_data)
-        logger.debug(f'Added new position to history for {node_id} (packet {pid})')
+        _append_position_history(node_id, lat, lon, alt, json_data, now=now)
+        logger.debug('Added new position to history for %s (packet %s)', node_id, pid)
     else:
-        logger.debug(f'Skipped gateway copy of position broadcast {pid} for {node_id}')
+        logger.debug('Skipped gateway copy of position broadcast %s for %s', pid, node_id)
 
 
 def on_position(json_data):
     """Process a position packet: validate, track, run the movement pipeline,
     update state, and record history. Orchestration only — each step lives in
     its own helper."""
-    global message_received, last_message_time
-    message_received = True
-    last_message_time = time.time()
+    now = time.time()
+    _mark_message_received()
 
     # Close any pending alert buffers whose window has elapsed.
     try:
         _check_expired_alert_buffers()
     except Exception as e:
-        logger.debug(f'_check_expired_alert_buffers failed: {e}')
+        logger.debug('_check_expired_alert_buffers failed: %s', e)
 
     try:
         node_id = json_data.get("from")
         channel = json_data.get("channel")
         payload = json_data["decoded"]["payload"]
+        if not node_id:
+            return
 
         # Reject corrupted / relay-quantized packets before any processing
         if not _validate_position_precision(payload, node_id=node_id):
             logger.info(f'Skipped position packet for node {node_id} due to insufficient precision')
             return
 
-        channel_name = _extract_channel_from_topic(node_id) if node_id else "Unknown"
-        if channel_name == "Unknown":
-            channel_name = json_data.get("channel_name", "Unknown")
+        channel_name, is_special = _packet_context(json_data, node_id, 'POSITION_APP', now)
 
-        is_special = _is_special_node(node_id) if node_id else False
-
-        # Track the packet FIRST so it is never lost to a later processing error
-        if is_special:
-            special_node_last_packet[node_id] = time.time()
-            if special_node_channels.get(node_id) != channel_name:
-                special_node_channels[node_id] = channel_name
-            _track_special_node_packet(node_id, 'POSITION_APP', json_data)
-
-        if node_id and "latitude_i" in payload and "longitude_i" in payload:
-            if node_id not in nodes_data:
-                nodes_data[node_id] = {}
+        if "latitude_i" in payload and "longitude_i" in payload:
+            nd = nodes_data.setdefault(node_id, {})
             if channel is not None:
-                nodes_data[node_id]["channel"] = channel
-            nodes_data[node_id]["channel_name"] = channel_name
+                nd["channel"] = channel
+            nd["channel_name"] = channel_name
 
             if is_special:
                 _process_special_movement(node_id, payload, json_data)
 
-            lat, lon, alt = _update_node_position(node_id, payload)
-            _update_best_signal(node_id, json_data)
-            _sync_gateway_position(node_id, lat, lon)
+            lat, lon, alt = _update_node_position(node_id, payload, now)
+            _update_best_signal(node_id, json_data, now)
+            _sync_gateway_position(node_id, lat, lon, now)
 
             if is_special:
-                _record_special_position(node_id, lat, lon, alt, json_data)
+                _record_special_position(node_id, lat, lon, alt, json_data, now)
 
             logger.info(f'Updated position for {node_id}: {lat:.4f}, {lon:.4f}')
     except Exception as e:
@@ -970,12 +991,16 @@ def _extract_battery_and_voltage_from_telemetry(node_id, payload):
                 if isinstance(device_metrics, dict):
                     battery_pct = device_metrics.get("battery_level")
 
-        if isinstance(battery_pct, str) and battery_pct.isdigit():
-            battery_pct = int(battery_pct)
-        if isinstance(battery_pct, (float, int)):
-            battery_pct = max(0, min(100, int(battery_pct)))
-        else:
-            battery_pct = None
+        if type(battery_pct) is int:
+            # Common case: estimated or protobuf-decoded integer percentage
+            battery_pct = 0 if battery_pct < 0 else 100 if battery_pct > 100 else battery_pct
+        elif battery_pct is not None:
+            if isinstance(battery_pct, str) and battery_pct.isdigit():
+                battery_pct = int(battery_pct)
+            if isinstance(battery_pct, (float, int)):
+                battery_pct = max(0, min(100, int(battery_pct)))
+            else:
+                battery_pct = None
 
     except Exception as e:
         logger.debug(f"Error extracting battery/voltage for {node_id}: {e}")
@@ -995,93 +1020,70 @@ def _merge_telemetry_payload(node_id, payload):
         node_id: Node ID to update telemetry for
         payload: Telemetry payload dictionary to merge
     """
-    if "telemetry" not in nodes_data[node_id]:
-        nodes_data[node_id]["telemetry"] = {}
+    telemetry = nodes_data[node_id].setdefault("telemetry", {})
 
     # Update timestamp
     if "time" in payload:
-        nodes_data[node_id]["telemetry"]["time"] = payload["time"]
+        telemetry["time"] = payload["time"]
 
     # Merge device_metrics if present
     if "device_metrics" in payload:
-        if "device_metrics" not in nodes_data[node_id]["telemetry"]:
-            nodes_data[node_id]["telemetry"]["device_metrics"] = {}
-        nodes_data[node_id]["telemetry"]["device_metrics"].update(payload["device_metrics"])
+        telemetry.setdefault("device_metrics", {}).update(payload["device_metrics"])
 
     # Merge power_metrics if present (preserve across packets)
     if "power_metrics" in payload:
-        if "power_metrics" not in nodes_data[node_id]["telemetry"]:
-            nodes_data[node_id]["telemetry"]["power_metrics"] = {}
-        nodes_data[node_id]["telemetry"]["power_metrics"].update(payload["power_metrics"])
+        telemetry.setdefault("power_metrics", {}).update(payload["power_metrics"])
 
 
 def on_telemetry(json_data):
     """Process telemetry messages - battery level, etc."""
-    global message_received, last_message_time
-    message_received = True
-    last_message_time = time.time()
+    now = time.time()
+    _mark_message_received()
 
     try:
-        node_id = json_data.get("from")
         payload = json_data["decoded"]["payload"]
+        node_id = json_data.get("from")
+        if not node_id:
+            return
+        channel_name, is_special = _packet_context(json_data, node_id, 'TELEMETRY_APP', now)
 
-        # Extract channel name ONCE (used throughout)
-        channel_name = _extract_channel_from_topic(node_id) if node_id else "Unknown"
-        if channel_name == "Unknown":
-            channel_name = json_data.get("channel_name", "Unknown")
+        # NOW do the rest of the processing (which might have errors)
+        nd = nodes_data.setdefault(node_id, {})
+        
+        # Store channel name from topic
+        nd["channel_name"] = channel_name
 
-        # Check if special node ONCE (used throughout)
-        is_special = _is_special_node(node_id) if node_id else False
+        # Merge telemetry payload (preserves power_metrics across multiple packets)
+        _merge_telemetry_payload(node_id, payload)
 
-        # IMPORTANT: Track and save packet IMMEDIATELY for special nodes, before any processing that might fail
-        # This ensures we never lose packet data due to processing errors
-        if node_id and is_special:
-            special_node_last_packet[node_id] = time.time()
-            # Update channel name if different
-            if special_node_channels.get(node_id) != channel_name:
-                special_node_channels[node_id] = channel_name
-            # Track packet FIRST, before any other processing
-            _track_special_node_packet(node_id, 'TELEMETRY_APP', json_data)
+        nd["last_seen"] = now
 
-        # NOW do the rest of the processing (which might have errors)
-        if node_id:
-            if node_id not in nodes_data:
-                nodes_data[node_id] = {}
-            
-            # Store channel name from topic
-            nodes_data[node_id]["channel_name"] = channel_name
-
-            # Merge telemetry payload (preserves power_metrics across multiple packets)
-            _merge_telemetry_payload(node_id, payload)
-
-            nodes_data[node_id]["last_seen"] = time.time()
-
-            battery_pct, voltage = _extract_battery_and_voltage_from_telemetry(node_id, payload)
-            nodes_data[node_id]["battery_pct"] = battery_pct
-            nodes_data[node_id]["voltage"] = voltage
-
-            logger.info(f'Updated telemetry for {node_id}: voltage={voltage}V, battery_pct={battery_pct}%')
-
-            if (_is_special_node(node_id)
-                    and (voltage is not None or battery_pct is not None)
-                    and _is_new_broadcast(node_id, json_data.get('id'))):
-                try:
-                    storage.record_telemetry(
-                        node_id, time.time(), voltage=voltage, battery_pct=battery_pct,
-                        rssi=json_data.get('rx_rssi'), snr=json_data.get('rx_snr'),
-                        simulated=bool(json_data.get('simulated')),
-                    )
-                except Exception as db_err:
-                    logger.error(f'Failed to record telemetry for {node_id}: {db_err}')
-            
-            # Best RSSI/SNR within a rolling window — same helper on_position uses.
-            _update_best_signal(node_id, json_data)
+        battery_pct, voltage = _extract_battery_and_voltage_from_telemetry(node_id, payload)
+        nd["battery_pct"] = battery_pct
+        nd["voltage"] = voltage
+
+        logger.info(f'Updated telemetry for {node_id}: voltage={voltage}V, battery_pct={battery_pct}%')
+
+        if (is_special
+                and (voltage is not None or battery_pct is not None)
+                and _is_new_broadcast(node_id, json_data.get('id'))):
+            try:
+                storage.record_telemetry(
+                    node_id, now, voltage=voltage, battery_pct=battery_pct,
+                    rssi=json_data.get('rx_rssi'), snr=json_data.get('rx_snr'),
+                    simulated=bool(json_data.get('simulated')),
+                )
+            except Exception as db_err:
+                logger.error(f'Failed to record telemetry for {node_id}: {db_err}')
+        
+        # Best RSSI/SNR within a rolling window — same helper on_position uses.
+        _update_best_signal(node_id, json_data, now)
 
-            # Add telemetry to special node history (if applicable)
-            _add_telemetry_to_history(node_id, json_data)
+        # Add telemetry to special node history (if applicable)
+        _add_telemetry_to_history(node_id, json_data, now=now)
 
-            # Check for low battery alert
-            _check_battery_alert(node_id, simulated=bool(json_data.get('simulated')))
+        # Check for low battery alert
+        _check_battery_alert(node_id, simulated=bool(json_data.get('simulated')))
 
     except Exception as e:
         logger.error(f'❌ Error processing telemetry: {e}', exc_info=True)
@@ -1089,10 +1091,8 @@ def on_telemetry(json_data):
 
 def on_neighborinfo(json_data):
     """Process neighbor info messages."""
-    global message_received, last_message_time
-    message_received = True
-    last_message_time = time.time()
-    
+    _mark_message_received()
+
     try:
         payload = json_data["decoded"]["payload"]
         logger.debug(f'Received neighborinfo: {payload}')
@@ -1100,82 +1100,78 @@ def on_neighborinfo(json_data):
         logger.error(f'Error processing neighborinfo: {e}')
 
 
+# Modem preset names indexed by Config.LoRaConfig.ModemPreset value:
+# LONG_FAST = 0, LONG_SLOW = 1, VERY_LONG_SLOW = 2,
+# MEDIUM_SLOW = 3, MEDIUM_FAST = 4, SHORT_SLOW = 5,
+# SHORT_FAST = 6, LONG_MODERATE = 7, SHORT_TURBO = 8
+_MODEM_PRESET_NAMES = (
+    "LongFast", "LongSlow", "VeryLongSlow", "MediumSlow", "MediumFast",
+    "ShortSlow", "ShortFast", "LongModerate", "ShortTurbo",
+)
+
+
+# MAP_REPORT fields copied onto the node: (camelCase key, snake_case key, nodes_data key).
+# Payloads from our protobuf decoder use snake_case; camelCase covers JSON-style sources.
+_MAP_REPORT_FIELDS = (
+    ("longName", "long_name", "long_name"),
+    ("shortName", "short_name", "short_name"),
+    ("hwModel", "hw_model", "hw_model"),
+    ("firmwareVersion", "firmware_version", "firmware_version"),
+    ("region", "region", "region"),
+    ("hasDefaultChannel", "has_default_channel", "has_default_channel"),
+)
+# Free text from the mesh, sanitized before display
+_MAP_REPORT_TEXT_FIELDS = frozenset(("long_name", "short_name"))
+
+
 def on_mapreport(json_data):
     """
     Process MAP_REPORT_APP messages (portnum 73).
     These packets contain modem_preset, region, firmware_version, and other metadata.
     This is the PRIMARY source of modem preset information!
     """
-    global message_received, last_message_time
-    message_received = True
-    last_message_time = time.time()
+    now = time.time()
+    _mark_message_received()
 
     try:
         payload = json_data["decoded"]["payload"]
         node_id = json_data.get("from")
-        # Try to get channel_name from our extracted topic mapping first
-        channel_name = _extract_channel_from_topic(node_id) if node_id else "Unknown"
-        # Fallback to what the library provides (usually "Unknown")
-        if channel_name == "Unknown":
-            channel_name = json_data.get("channel_name", "Unknown")
-        
-        # Track special node packets and channel info
-        if node_id:
-            if _is_special_node(node_id):
-                special_node_last_packet[node_id] = time.time()
-                # Update channel name if different
-                if special_node_channels.get(node_id) != channel_name:
-                    special_node_channels[node_id] = channel_name
-                # Track packet (only for special nodes)
-                _track_special_node_packet(node_id, 'MAP_REPORT_APP', json_data)
-        
-        if node_id and isinstance(payload, dict):
-            if node_id not in nodes_data:
-                nodes_data[node_id] = {}
-            
-            nodes_data[node_id]["last_seen"] = time.time()
+        if not node_id:
+            return
+        channel_name, _ = _packet_context(json_data, node_id, 'MAP_REPORT_APP', now)
+
+        if isinstance(payload, dict):
+            # Collect everything, then apply to the node in one update()
+            updates = {"last_seen": now}
             
             # Extract modem preset - THIS IS WHAT WE NEED!
-            # Reference values from Meshtastic protobufs:
-            # LONG_FAST = 0, LONG_SLOW = 1, VERY_LONG_SLOW = 2,
-            # MEDIUM_SLOW = 3, MEDIUM_FAST = 4, SHORT_SLOW = 5,
-            # SHORT_FAST = 6, LONG_MODERATE = 7, SHORT_TURBO = 8
             modem_preset_value = payload.get("modemPreset") or payload.get("modem_preset")
             if modem_preset_value is not None:
                 # Map numeric values to human-readable names
-                preset_names = {
-                    0: "LongFast",
-                    1: "LongSlow",
-                    2: "VeryLongSlow",
-                    3: "MediumSlow",
-                    4: "MediumFast",
-                    5: "ShortSlow",
-                    6: "ShortFast",
-                    7: "LongModerate",
-                    8: "ShortTurbo"
-                }
                 if isinstance(modem_preset_value, int):
-                    channel_name = preset_names.get(modem_preset_value, f"Preset{modem_preset_value}")
+                    if 0 <= modem_preset_value < len(_MODEM_PRESET_NAMES):
+                        channel_name = _MODEM_PRESET_NAMES[modem_preset_value]
+                    else:
+                        channel_name = f"Preset{modem_preset_value}"
                 else:
                     channel_name = str(modem_preset_value)
+                channel_name = sys.intern(channel_name)  # few distinct presets; share one string each
                 
-                nodes_data[node_id]["channel_name"] = channel_name
-                nodes_data[node_id]["modem_preset"] = channel_name
+                updates["channel_name"] = channel_name
+                updates["modem_preset"] = channel_name
                 logger.info(f'Updated modem preset for {node_id}: {channel_name}')
             
             # Also extract other useful info from MAP_REPORT
-            if "longName" in payload or "long_name" in payload:
-                nodes_data[node_id]["long_name"] = _sanitize_display_text(payload.get("longName") or payload.get("long_name"))
-            if "shortName" in payload or "short_name" in payload:
-                nodes_data[node_id]["short_name"] = _sanitize_display_text(payload.get("shortName") or payload.get("short_name"))
-            if "hwModel" in payload or "hw_model" in payload:
-                nodes_data[node_id]["hw_model"] = payload.get("hwModel") or payload.get("hw_model")
-            if "firmwareVersion" in payload or "firmware_version" in payload:
-                nodes_data[node_id]["firmware_version"] = payload.get("firmwareVersion") or payload.get("firmware_version")
-            if "region" in payload:
-                nodes_data[node_id]["region"] = payload.get("region")
-            if "hasDefaultChannel" in payload or "has_default_channel" in payload:
-                nodes_data[node_id]["has_default_channel"] = payload.get("hasDefaultChannel") or payload.get("has_default_channel")
+            for camel, snake, target in _MAP_REPORT_FIELDS:
+                value = payload.get(camel)
+                if value is None:
+                    value = payload.get(snake)
+                if value is not None:
+                    if target in _MAP_REPORT_TEXT_FIELDS:
+                        value = _sanitize_display_text(value)
+                    updates[target] = value
+
+            nodes_data.setdefault(node_id, {}).update(updates)
             
             logger.info(f'Processed MAP_REPORT for {node_id}')
             
@@ -1183,24 +1179,29 @@ def on_mapreport(json_data):
         logger.error(f'Error processing mapreport: {e}')
 
 
-def _decrypt_message_packet(mp, key_bytes):
+@lru_cache(maxsize=4)
+def _aes_algorithm(key_bytes):
+    """AES algorithm object for the channel key, built once and reused for every packet."""
+    return algorithms.AES(key_bytes)
+
+
+def _decrypt_message_packet(mp, key_bytes, mp_id, mp_from):
     """
     Decrypt an encrypted Meshtastic message packet.
-    Uses AES-CTR with nonce derived from packet ID and sender ID.
+    Uses AES-CTR with nonce derived from packet ID and sender ID
+    (mp_id / mp_from, already read off mp by the caller).
     """
     try:
-        # Extract the nonce from the packet
-        nonce_packet_id = getattr(mp, 'id').to_bytes(8, 'little')
-        nonce_from_node = getattr(mp, 'from').to_bytes(8, 'little')
-        nonce = nonce_packet_id + nonce_from_node
+        # Build the nonce from the packet
+        nonce = mp_id.to_bytes(8, 'little') + mp_from.to_bytes(8, 'little')
 
         # Decrypt the message
-        cipher = Cipher(algorithms.AES(key_bytes), modes.CTR(nonce), backend=default_backend())
+        cipher = Cipher(_aes_algorithm(key_bytes), modes.CTR(nonce))
         decryptor = cipher.decryptor()
-        decrypted_bytes = decryptor.update(getattr(mp, 'encrypted')) + decryptor.finalize()
+        decrypted_bytes = decryptor.update(mp.encrypted) + decryptor.finalize()
         
-        # Parse the decrypted message
-        data = mesh_pb2.Data()
+        # Parse the decrypted message (ParseFromString clears the reused instance first)
+        data = _DECRYPTED_DATA
         try:
             data.ParseFromString(decrypted_bytes)
         except:
@@ -1210,32 +1211,19 @@ def _decrypt_message_packet(mp, key_bytes):
         return mp
 
     except Exception as e:
-        logger.debug(f'Error decrypting message: {e}')
+        logger.debug('Error decrypting message: %s', e)
         return None
 
 
-def _protobuf_to_json(proto_obj):
+def _protobuf_to_json(proto_obj, fields=None):
     """
     Convert a protobuf message to JSON-serializable dict.
-    Handles NaN values by removing them.
+    Handles NaN values by removing them. fields: optional top-level field whitelist.
     """
     try:
-        json_str = MessageToJson(proto_obj, preserving_proto_field_name=True)
-        data = json.loads(json_str)
-        
-        # Remove empty values and NaN
-        def clean_dict(d):
-            if isinstance(d, dict):
-                return {k: clean_dict(v) for k, v in d.items() 
-                       if str(v) not in ('None', 'nan', '', 'null', 'NaN')}
-            elif isinstance(d, list):
-                return [clean_dict(v) for v in d 
-                       if str(v) not in ('None', 'nan', '', 'null', 'NaN')]
-            return d
-        
-        return clean_dict(data)
+        return message_to_dict(proto_obj, fields)
     except Exception as e:
-        logger.debug(f"Error converting protobuf to JSON: {e}")
+        logger.debug("Error converting protobuf to JSON: %s", e)
         return {}
 
 
@@ -1244,12 +1232,12 @@ def _on_mqtt_subscribe(client_obj, userdata, mid, reason_code_list, properties):
     MQTT subscribe callback - called when broker confirms subscription.
     Logs the confirmation to verify subscriptions were accepted.
     """
-    logger.info(f"[MQTT] Broker confirmed subscription (mid={mid}, count={len(reason_code_list)})")
+    logger.info("[MQTT] Broker confirmed subscription (mid=%s, count=%s)", mid, len(reason_code_list))
     for i, reason_code in enumerate(reason_code_list):
         if reason_code >= 128:
             logger.error(f"[MQTT] Subscription #{i+1} FAILED with reason code: {reason_code}")
         else:
-            logger.info(f"[MQTT] Subscription #{i+1} accepted with QoS: {reason_code}")
+            logger.info("[MQTT] Subscription #%s accepted with QoS: %s", i+1, reason_code)
 
 
 def _on_mqtt_connect(client_obj, userdata, flags, reason_code, properties):
@@ -1275,11 +1263,11 @@ def _on_mqtt_connect(client_obj, userdata, flags, reason_code, properties):
         base_topic = config.MQTT_ROOT_TOPIC.rstrip('/') + '/' + config.MQTT_CHANNEL_NAME
         subscribe_topic = base_topic + '/#'
         result, mid = client_obj.subscribe(subscribe_topic, qos=0)
-        logger.info(f"✅ Subscribed to: {subscribe_topic} (result={result}, mid={mid})")
+        logger.info("✅ Subscribed to: %s (result=%s, mid=%s)", subscribe_topic, result, mid)
 
         # Mark as connected
         message_received = True
-        last_message_time = time.time()
+        last_message_time = time.monotonic_ns()
     else:
         logger.error(f'❌ Connection failed with code: {reason_code}')
 
@@ -1302,54 +1290,77 @@ def _on_mqtt_disconnect(client_obj, userdata, disconnect_flags, reason_code, pro
 
 def _on_mqtt_message(client_obj, userdata, msg):
     """
-    Main paho-mqtt message callback.
-    Receives raw encoded MQTT messages, decodes them, and routes to handlers.
+    Main paho-mqtt message callback (runs on paho's network thread).
+    Only stamps the packet time and queues the message; decoding and routing
+    happen in _process_mqtt_message on the packet worker thread, so the socket
+    keeps being read while a packet is being handled.
+    """
+    global last_packet_time, _packets_dropped
+
+    # Mark that we received a packet (update timestamp for staleness detection)
+    last_packet_time = time.monotonic_ns()
+
+    try:
+        _packet_queue.put_nowait(msg)
+    except queue.Full:
+        _packets_dropped += 1
+        if _packets_dropped % 1000 == 1:
+            logger.warning(f'Packet queue full ({_PACKET_QUEUE_MAX}); dropped {_packets_dropped} packet(s) so far')
+    # Checked after queueing: a worker only exits once the queue is empty
+    if _packet_worker_thread is None:
+        _start_packet_worker()
+
+
+def _process_mqtt_message(msg):
+    """
+    Decode one queued MQTT message and route it to its handler.
+    Runs on the packet worker thread (see _packet_worker).
     """
-    global message_received, last_message_time, packets_received, last_packet_time
+    global message_received, last_message_time, packets_received
+
+    logger.debug('[MQTT] _on_mqtt_message CALLED: topic=%s', msg.topic)
+    logger.debug('[DEBUG] Message details: topic=%s, payload_size=%s bytes, qos=%s, retain=%s', msg.topic, len(msg.payload), msg.qos, msg.retain)
 
-    logger.info(f'[MQTT] _on_mqtt_message CALLED: topic={msg.topic}')
-    logger.debug(f'[DEBUG] Message details: topic={msg.topic}, payload_size={len(msg.payload)} bytes, qos={msg.qos}, retain={msg.retain}')
+    # Parse the topic once: channel name and gateway !nodeid for this message
+    topic_info = parse_topic(msg.topic)
 
-    # Check if this is a special node
-    for node_id in config.SPECIAL_NODE_IDS:
-        node_hex = f"!{node_id:08x}"
-        if node_hex in msg.topic:
-            node_label = config.SPECIAL_NODES.get(node_id, {}).get('label', node_hex)
-            logger.info(f'[DEBUG] ⭐ SPECIAL NODE MESSAGE: {node_label} ({node_hex}) on topic {msg.topic}')
-            break
+    # Check if this is a special node: look the topic's !nodeid up, instead of
+    # formatting and substring-searching every special id
+    topic_node_id = topic_info.gateway_id
+    if topic_node_id is not None and _is_special_node(topic_node_id):
+        node_hex = f"!{topic_node_id:08x}"
+        node_label = _SPECIAL_NODE_CONFIG[topic_node_id].get('label', node_hex)
+        logger.info('[DEBUG] ⭐ SPECIAL NODE MESSAGE: %s (%s) on topic %s', node_label, node_hex, msg.topic)
 
     try:
-        # Mark that we received a packet (update timestamp for staleness detection)
-        last_packet_time = time.time()
-        
-        # Extract channel from MQTT topic path
-        channel_name = _extract_channel_from_mqtt_topic(msg.topic)
+        # Channel from MQTT topic path
+        channel_name = topic_info.channel_name
         
         # Parse MQTT ServiceEnvelope protobuf
-        service_envelope = mqtt_pb2.ServiceEnvelope()
+        service_envelope = _ENVELOPE
         try:
             service_envelope.ParseFromString(msg.payload)
         except Exception as e:
-            logger.debug(f"Error parsing ServiceEnvelope: {e}")
+            logger.debug("Error parsing ServiceEnvelope: %s", e)
             return
         
-        # Extract MeshPacket from envelope
+        # Extract MeshPacket from envelope; read header fields once
         mp = service_envelope.packet
+        mp_from = getattr(mp, 'from')  # 'from' is a Python keyword
         
         # Handle encrypted packets
         if mp.HasField('encrypted'):
-            mp = _decrypt_message_packet(mp, userdata['key_bytes'])
+            mp = _decrypt_message_packet(mp, _CHANNEL_KEY, mp.id, mp_from)
             if not mp:
                 return
         
         # Extract portnum (message type) and get name
         portnum = mp.decoded.portnum
-        try:
-            portnum_name = portnums_pb2.PortNum.Name(portnum)
-        except ValueError:
+        portnum_name = _PORTNUM_NAMES.get(portnum)
+        if portnum_name is None:
             # Handle unknown portnum values gracefully (e.g., new types not in our proto definitions)
             portnum_name = f"UNKNOWN_PORTNUM_{portnum}"
-            logger.debug(f"Received packet with unknown PortNum value: {portnum}")
+            logger.debug("Received packet with unknown PortNum value: %s", portnum)
         
         # Convert to JSON for callbacks (preserving meshtastic_mqtt_json format)
         json_packet = _protobuf_to_json(mp)
@@ -1357,23 +1368,24 @@ def _on_mqtt_message(client_obj, userdata, msg):
         # Add channel name, topic, and from/to info
         json_packet['channel_name'] = channel_name
         json_packet['mqtt_topic'] = msg.topic  # Store the MQTT topic for gateway extraction
-        if 'from' not in json_packet:
-            json_packet['from'] = getattr(mp, 'from')
-        if 'to' not in json_packet:
-            json_packet['to'] = getattr(mp, 'to')
-        if 'channel' not in json_packet:
-            json_packet['channel'] = mp.channel
+        json_packet['gateway_id'] = topic_info.gateway_id  # Parsed once; see packet_gateway_id()
+        # Always present, even when 0 (the converter omits proto3 defaults)
+        json_packet['from'] = mp_from
+        json_packet['to'] = mp.to
+        json_packet['channel'] = mp.channel
         
-        # Extract signal quality metrics from MeshPacket
-        if hasattr(mp, 'rx_rssi') and mp.rx_rssi != 0:
-            json_packet['rx_rssi'] = mp.rx_rssi
-        if hasattr(mp, 'rx_snr') and mp.rx_snr != 0:
-            json_packet['rx_snr'] = mp.rx_snr
+        # Extract signal quality metrics from MeshPacket (proto3 scalars: 0 = not reported)
+        rx_rssi = mp.rx_rssi
+        if rx_rssi:
+            json_packet['rx_rssi'] = rx_rssi
+        rx_snr = mp.rx_snr
+        if rx_snr:
+            json_packet['rx_snr'] = rx_snr
 
         # Mark as received
         message_received = True
         packets_received = True
-        last_message_time = time.time()
+        last_message_time = last_packet_time
         
         # Route to appropriate handler based on message type
         _route_message_to_handler(portnum, portnum_name, mp, json_packet)
@@ -1382,82 +1394,167 @@ def _on_mqtt_message(client_obj, userdata, msg):
         logger.error(f"Error in MQTT message handler: {e}", exc_info=True)
 
 
+# Payload decoding and handler per portnum: portnum -> (protobuf class, handler, log tag).
+# Portnums not listed here are counted as received but not decoded.
+# MAP_REPORT_APP is deliberately absent: it has never been decoded here, and
+# on_mapreport would overwrite the node's topic channel and long name.
+_PORTNUM_DISPATCH = {
+    portnums_pb2.POSITION_APP: (mesh_pb2.Position, on_position, '📍 POSITION'),
+    portnums_pb2.NODEINFO_APP: (mesh_pb2.User, on_nodeinfo, 'ℹ️ NODEINFO'),
+    portnums_pb2.TELEMETRY_APP: (telemetry_pb2.Telemetry, on_telemetry, '🔋 TELEMETRY'),
+    portnums_pb2.NEIGHBORINFO_APP: (mesh_pb2.NeighborInfo, on_neighborinfo, '🕸️ NEIGHBORINFO'),
+}
+
+# Top-level payload fields the handlers (and packet tracking / movement alerts)
+# actually read, per high-volume portnum. Anything else in the payload is never
+# looked at, so it isn't converted. Portnums not listed get the full payload:
+# NODEINFO's name fallback scans every string field, and NEIGHBORINFO is rare.
+_PAYLOAD_FIELDS = {
+    portnums_pb2.POSITION_APP: frozenset(('latitude_i', 'longitude_i', 'altitude', 'precision_bits')),
+    portnums_pb2.TELEMETRY_APP: frozenset(('time', 'device_metrics', 'power_metrics')),
+}
+
+# portnum -> enum name, so the receive path doesn't walk the enum descriptor per packet
+_PORTNUM_NAMES = {v.number: v.name for v in portnums_pb2.PortNum.DESCRIPTOR.values}
+
+# Reused protobuf instances for the receive path. Messages are parsed and
+# converted to dicts one at a time on the packet worker thread, and nothing keeps
+# a reference past that, so one instance per message type is enough.
+# ParseFromString() clears the instance before parsing into it.
+# (Payload instances live in the per-portnum routes below.)
+_ENVELOPE = mqtt_pb2.ServiceEnvelope()
+_DECRYPTED_DATA = mesh_pb2.Data()
+
+
+def _make_payload_route(portnum, proto_class, handler, tag):
+    """
+    Build the decode-and-dispatch function for one _PORTNUM_DISPATCH entry.
+    Its payload message instance, field whitelist and handler are bound once
+    here, so the per-packet path does no table lookups or tuple unpacking.
+    """
+    data = proto_class()
+    fields = _PAYLOAD_FIELDS.get(portnum)
+    portnum_name = _PORTNUM_NAMES.get(portnum, f"UNKNOWN_PORTNUM_{portnum}")
+
+    def route(mp, json_packet, from_id):
+        # Decode payload based on message type
+        try:
+            data.ParseFromString(mp.decoded.payload)
+            json_packet['decoded']['payload'] = _protobuf_to_json(data, fields)
+        except Exception as e:
+            logger.debug("Error decoding payload for %s: %s", portnum_name, e)
+            return
+
+        logger.debug('%s packet from %s', tag, from_id)
+        try:
+            handler(json_packet)
+            logger.debug('✅ Successfully processed %s from %s', portnum_name, from_id)
+        except Exception as handler_err:
+            logger.error(f'❌ Error processing {portnum_name} from {from_id}: {handler_err}', exc_info=True)
+
+    return route
+
+
+# portnum -> route function built from _PORTNUM_DISPATCH
+_PORTNUM_ROUTES = {portnum: _make_payload_route(portnum, *entry) for portnum, entry in _PORTNUM_DISPATCH.items()}
+
+
+# Receive queue between paho's network thread and the single packet worker.
+# Bounded so a stalled worker can't grow memory without limit; messages that
+# arrive while it is full are dropped (and counted) rather than blocking paho.
+_PACKET_QUEUE_MAX = 10000
+_packet_queue = queue.Queue(maxsize=_PACKET_QUEUE_MAX)
+_packet_worker_thread = None
+_packet_worker_lock = threading.Lock()
+_packets_dropped = 0
+_PACKET_BATCH_MAX = 256  # Most messages the worker takes off the queue per wakeup
+_STOP_WORKER = object()  # Queue sentinel: worker exits once it reads this and the queue is empty
+
+
+def _packet_worker():
+    """Process queued MQTT messages in arrival order until told to stop.
+
+    Blocks for one message, then takes whatever else is already queued (up to
+    _PACKET_BATCH_MAX) without waiting, so a burst costs one wakeup instead
+    of one per message. The batch is still handled strictly in order.
+
+    The worker clears _packet_worker_thread itself when it exits, so there is
+    never more than one worker sharing the reused protobuf messages.
+    """
+    global _packet_worker_thread
+    get_nowait = _packet_queue.get_nowait
+    while True:
+        batch = [_packet_queue.get()]
+        try:
+            while len(batch) < _PACKET_BATCH_MAX:
+                batch.append(get_nowait())
+        except queue.Empty:
+            pass
+
+        stop = False
+        for item in batch:
+            if item is _STOP_WORKER:
+                stop = True
+            else:
+                _process_mqtt_message(item)
+
+        if stop:
+            with _packet_worker_lock:
+                # Anything queued after the sentinel would otherwise sit
+                # there with no worker to pick it up
+                if _packet_queue.empty():
+                    if _packet_worker_thread is threading.current_thread():
+                        _packet_worker_thread = None
+                    return
+
+
+def _start_packet_worker():
+    """Start the packet worker thread if it isn't running (safe to call repeatedly)."""
+    global _packet_worker_thread
+    with _packet_worker_lock:
+        if _packet_worker_thread is not None and _packet_worker_thread.is_alive():
+            return
+        _packet_worker_thread = threading.Thread(target=_packet_worker, name='mqtt-packet-worker', daemon=True)
+        _packet_worker_thread.start()
+
+
+def _stop_packet_worker(timeout=5):
+    """Let the worker finish what is already queued, then stop it.
+
+    The handle is left in place until the worker actually exits, so a worker
+    that outlives the timeout still blocks _start_packet_worker().
+    """
+    thread = _packet_worker_thread
+    if thread is None:
+        return
+    try:
+        _packet_queue.put(_STOP_WORKER, timeout=timeout)
+        thread.join(timeout)
+    except queue.Full:
+        pass
+    if thread.is_alive():
+        logger.warning('Packet worker did not drain its queue in time; it will stop once the queue is empty')
+
+
 def _route_message_to_handler(portnum, portnum_name, mp, json_packet):
     """
     Route decoded message to appropriate handler based on message type.
-    Decodes payload based on app type, then calls the corresponding handler.
+    Decoding and the handler call are done by the portnum's route (_make_payload_route).
     """
     try:
         # Log all incoming packets to see what we're receiving
         from_id = json_packet.get('from')
-        logger.info(f'MSG: portnum={portnum} ({portnum_name}), from={from_id}')
+        logger.info('MSG: portnum=%s (%s), from=%s', portnum, portnum_name, from_id)
         
         # Ensure decoded payload structure
         if 'decoded' not in json_packet:
             json_packet['decoded'] = {}
         if 'payload' not in json_packet['decoded']:
             json_packet['decoded']['payload'] = {}
-        
-        # Decode payload based on message type
-        try:
-            if portnum == portnums_pb2.ADMIN_APP:
-                data = mesh_pb2.Admin()
-                data.ParseFromString(mp.decoded.payload)
-                json_packet['decoded']['payload'] = _protobuf_to_json(data)
-            
-            elif portnum == portnums_pb2.POSITION_APP:
-                logger.debug(f'📍 POSITION packet from {from_id}')
-                data = mesh_pb2.Position()
-                data.ParseFromString(mp.decoded.payload)
-                json_packet['decoded']['payload'] = _protobuf_to_json(data)
-                from_id = json_packet.get('from')
-                try:
-                    on_position(json_packet)
-                    logger.debug(f'✅ Successfully processed POSITION from {from_id}')
-                except Exception as pos_err:
-                    logger.error(f'❌ Error processing POSITION from {from_id}: {pos_err}', exc_info=True)
-                return
-            
-            elif portnum == portnums_pb2.NODEINFO_APP:
-                logger.debug(f'ℹ️ NODEINFO packet from {from_id}')
-                data = mesh_pb2.User()
-                data.ParseFromString(mp.decoded.payload)
-                json_packet['decoded']['payload'] = _protobuf_to_json(data)
-                try:
-                    on_nodeinfo(json_packet)
-                    logger.debug(f'✅ Successfully processed NODEINFO from {from_id}')
-                except Exception as node_err:
-                    logger.error(f'❌ Error processing NODEINFO from {from_id}: {node_err}', exc_info=True)
-                return
-            
-            elif portnum == portnums_pb2.TELEMETRY_APP:
-                logger.debug(f'🔋 TELEMETRY packet from {from_id}')
-                data = telemetry_pb2.Telemetry()
-                data.ParseFromString(mp.decoded.payload)
-                json_packet['decoded']['payload'] = _protobuf_to_json(data)
-                try:
-                    on_telemetry(json_packet)
-                    logger.debug(f'✅ Successfully processed TELEMETRY from {from_id}')
-                except Exception as tel_err:
-                    logger.error(f'❌ Error processing TELEMETRY from {from_id}: {tel_err}', exc_info=True)
-                return
-            
-            elif portnum == portnums_pb2.MAP_REPORT_APP:
-                data = mesh_pb2.MapReport()
-                data.ParseFromString(mp.decoded.payload)
-                json_packet['decoded']['payload'] = _protobuf_to_json(data)
-                on_mapreport(json_packet)
-                return
-            
-            elif portnum == portnums_pb2.NEIGHBORINFO_APP:
-                data = mesh_pb2.NeighborInfo()
-                data.ParseFromString(mp.decoded.payload)
-                json_packet['decoded']['payload'] = _protobuf_to_json(data)
-                on_neighborinfo(json_packet)
-                return
-            
-        except Exception as e:
-            logger.debug(f"Error decoding payload for {portnum_name}: {e}")
+
+        route = _PORTNUM_ROUTES.get(portnum)
+        if route is not None:
+            route(mp, json_packet, from_id)
     
     except Exception as e:
         logger.error(f"Error routing message {portnum_name}: {e}", exc_info=True)
@@ -1480,6 +1577,14 @@ def connect_mqtt():
         logger.info(f'Connecting to MQTT broker: {config.MQTT_BROKER}:{config.MQTT_PORT}')
         logger.info(f'Channel: {config.MQTT_CHANNEL_NAME}')
 
+        # Every packet goes through protobuf parsing; make a slow backend visible
+        protobuf_backend = api_implementation.Type()
+        if protobuf_backend == 'python':
+            logger.warning('Protobuf is using the pure-Python backend; packet decoding will be slow '
+                           '(install protobuf>=4.21 for the upb backend)')
+        else:
+            logger.info(f'Protobuf backend: {protobuf_backend}')
+
         # Create paho-mqtt client with automatic reconnection enabled
         client = mqtt_client.Client(
             mqtt_client.CallbackAPIVersion.VERSION2,
@@ -1496,27 +1601,16 @@ def connect_mqtt():
                 password=config.MQTT_PASSWORD
             )
 
-        # Prepare encryption key
-        key_str = getattr(config, 'MQTT_KEY', 'AQ==')
-        if key_str == 'AQ==':
-            key_str = '1PG7OiApB1nwvP+rz05pAQ=='
-
-        # Decode and pad base64 key
-        padded_key = key_str.ljust(len(key_str) + ((4 - (len(key_str) % 4)) % 4), '=')
-        replaced_key = padded_key.replace('-', '+').replace('_', '/')
-        try:
-            key_bytes = base64.b64decode(replaced_key.encode('ascii'))
-        except Exception as e:
-            logger.error(f"Error decoding encryption key: {e}")
+        # Encryption key is decoded once with the rest of the config cache
+        if _CHANNEL_KEY is None:
             client = None
             return False
 
-        # Set callbacks and userdata
+        # Set callbacks
         client.on_message = _on_mqtt_message
         client.on_disconnect = _on_mqtt_disconnect
         client.on_connect = _on_mqtt_connect
         client.on_subscribe = _on_mqtt_subscribe
-        client.user_data_set({'key_bytes': key_bytes})
 
         # Connect to broker (non-blocking, handled by loop_start)
         try:
@@ -1527,14 +1621,15 @@ def connect_mqtt():
             client = None
             return False
 
-        # Start the background network loop - handles reconnection automatically
-        # This runs in its own thread and manages connection state
+        # Start the packet worker, then the background network loop - handles
+        # reconnection automatically. This runs in its own thread and manages connection state
+        _start_packet_worker()
         client.loop_start()
         logger.info('✅ MQTT network loop started (automatic reconnection enabled)')
 
         # Mark that we attempted connection
         message_received = False  # Will be set to True on first message
-        last_message_time = time.time()
+        last_message_time = time.monotonic_ns()
 
         logger.info('✅ MQTT client ready - waiting for connection confirmation')
 
@@ -1563,7 +1658,7 @@ def _initialize_special_nodes_at_startup():
     global nodes_data
 
     for node_id in getattr(config, 'SPECIAL_NODE_IDS', []):
-        special_info = getattr(config, 'SPECIAL_NODES', {}).get(node_id, {})
+        special_info = _SPECIAL_NODE_CONFIG.get(node_id, {})
         home_lat = special_info.get('home_lat')
         home_lon = special_info.get('home_lon')
         label = special_info.get('label')
@@ -1602,6 +1697,7 @@ def disconnect_mqtt():
             client.loop_stop()
             client.disconnect()
             logger.info("Disconnected from MQTT broker")
+        _stop_packet_worker()
     except Exception as e:
         logger.error(f'Error disconnecting from MQTT broker: {e}')
     finally:
@@ -1614,7 +1710,10 @@ def reload_mqtt_subscriptions():
     Unsubscribes from all current topics and resubscribes based on show_all_nodes and show_gateways.
     This allows dynamic switching between all-nodes and special-nodes-only modes.
     """
-    global client
+    global client, _staleness_threshold
+
+    # show_all_nodes/show_gateways may have changed: pick the threshold up again
+    _staleness_threshold = None
 
     if not client:
         logger.warning("Cannot reload subscriptions: MQTT client not connected")
@@ -1652,10 +1751,13 @@ def reload_mqtt_subscriptions():
 def update_special_nodes():
     """Update special nodes configuration from reloaded config.
     This allows adding/removing special nodes without restarting the server."""
+    global _staleness_threshold
     try:
         # Reload the config module to get updated values
         import importlib
         importlib.reload(config)
+        _refresh_config_cache()
+        _staleness_threshold = None
         
         # Log the updated special nodes
         special_count = len(getattr(config, 'SPECIAL_NODE_IDS', []))
@@ -1664,7 +1766,7 @@ def update_special_nodes():
         # Recalculate origin coordinates and movement status for all special nodes based on new config
         for node_id in getattr(config, 'SPECIAL_NODE_IDS', []):
             if node_id in nodes_data:
-                special_node_config = getattr(config, 'SPECIAL_NODES', {}).get(node_id, {})
+                special_node_config = _SPECIAL_NODE_CONFIG.get(node_id, {})
                 home_lat = special_node_config.get('home_lat')
                 home_lon = special_node_config.get('home_lon')
                 
@@ -1679,7 +1781,7 @@ def update_special_nodes():
                     if lat is not None and lon is not None:
                         dist = _haversine_m(home_lat, home_lon, lat, lon)
                         nodes_data[node_id]["distance_from_origin_m"] = dist
-                        nodes_data[node_id]["moved_far"] = bool(dist >= getattr(config, 'SPECIAL_MOVEMENT_THRESHOLD_METERS', 50.0))
+                        nodes_data[node_id]["moved_far"] = bool(dist >= config.SPECIAL_MOVEMENT_THRESHOLD_METERS)
                         logger.info(f"Recalculated movement for node {node_id}: {dist:.1f}m from origin, moved_far={nodes_data[node_id]['moved_far']}")
         
         return True
@@ -1702,20 +1804,25 @@ def is_connected():
     - 5 minutes when subscribed to all nodes (high traffic)
     - 60 minutes when subscribed to special nodes only (low traffic)
     """
+    global _staleness_threshold
     try:
-        current_time = time.time()
-
-        # Determine which staleness threshold to use based on subscription mode
-        # If both show_all_nodes and show_gateways are false, we're in special-nodes-only mode
-        if (not getattr(config, 'SHOW_ALL_NODES', False) and
-            not getattr(config, 'SHOW_GATEWAYS', True)):
-            staleness_threshold = PACKET_STALENESS_THRESHOLD_SPECIAL_ONLY
-        else:
-            staleness_threshold = PACKET_STALENESS_THRESHOLD_ALL_NODES
+        current_ns = time.monotonic_ns()
+
+        # Staleness threshold depends on subscription mode; it only changes on a
+        # settings change / config reload, which resets the cached value
+        staleness_threshold = _staleness_threshold
+        if staleness_threshold is None:
+            # If both show_all_nodes and show_gateways are false, we're in special-nodes-only mode
+            if (not getattr(config, 'SHOW_ALL_NODES', False) and
+                not getattr(config, 'SHOW_GATEWAYS', True)):
+                staleness_threshold = PACKET_STALENESS_THRESHOLD_SPECIAL_ONLY
+            else:
+                staleness_threshold = PACKET_STALENESS_THRESHOLD_ALL_NODES
+            _staleness_threshold = staleness_threshold
 
         # If we have received packets and the last one is recent (within threshold)
         if packets_received and last_packet_time > 0:
-            time_since_last_packet = current_time - last_packet_time
+            time_since_last_packet = (current_ns - last_packet_time) / 1e9
             if time_since_last_packet < staleness_threshold:
                 return 'receiving_packets'
             else:
@@ -1748,6 +1855,7 @@ from .api_views import (  # noqa: E402  (must import after state is defined)
     _build_gateway_only_node,
     get_nodes,
     get_special_history,
+    get_all_special_history,
     _deduplicate_by_hour,
     get_signal_history,
 )
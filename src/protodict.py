@@ -0,0 +1,166 @@
+"""Protobuf message -> plain dict conversion for decoded MQTT packets.
+
+Produces the same shape MessageToJson(preserving_proto_field_name=True) +
+json.loads + the old clean_dict pass did, in a single walk over ListFields():
+
+- proto field names as keys; only populated fields appear
+- enums as their value name (unknown numbers stay ints)
+- 64-bit integers as decimal strings, bytes as base64 text
+- float32 values as their shortest round-tripping decimal (3.3, not 3.2999999523)
+- NaN floats dropped; +/-inf as "Infinity"/"-Infinity"
+- empty / "None" / "null" / "nan" strings dropped (clean_dict sentinels)
+
+Converters are built once per field descriptor and cached, so the per-packet
+cost is a dict lookup and a call per populated field. Callers that only read a
+few top-level fields can pass them as `fields`; other fields are skipped
+without being converted.
+"""
+
+import base64
+import math
+import struct
+
+from google.protobuf.descriptor import FieldDescriptor
+
+# Marker for values the old clean_dict pass would have dropped
+_DROP = object()
+
+# String values clean_dict treated as empty
+_DROPPED_STRINGS = frozenset(('', 'None', 'nan', 'null', 'NaN'))
+
+_INT64_TYPES = frozenset((
+    FieldDescriptor.TYPE_INT64, FieldDescriptor.TYPE_UINT64,
+    FieldDescriptor.TYPE_FIXED64, FieldDescriptor.TYPE_SFIXED64,
+    FieldDescriptor.TYPE_SINT64,
+))
+
+_FLOAT32 = struct.Struct('<f')
+
+# field descriptor -> converter(value) for that field's (possibly repeated) value
+_FIELD_CONVERTERS = {}
+
+
+def _to_float32(value):
+    return _FLOAT32.unpack(_FLOAT32.pack(value))[0]
+
+
+def _shortest_float32(value):
+    """Shortest decimal that reads back as the same float32."""
+    precision = 6
+    rounded = float(f'{value:.{precision}g}')
+    while _to_float32(rounded) != value:
+        precision += 1
+        rounded = float(f'{value:.{precision}g}')
+    return rounded
+
+
+def _convert_double(value):
+    if value != value:
+        return _DROP
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    return value
+
+
+def _convert_float(value):
+    if value != value:
+        return _DROP
+    if math.isinf(value):
+        return 'Infinity' if value > 0 else '-Infinity'
+    return _shortest_float32(value)
+
+
+def _convert_string(value):
+    return _DROP if value in _DROPPED_STRINGS else value
+
+
+def _convert_bytes(value):
+    return _convert_string(base64.b64encode(value).decode('ascii'))
+
+
+def _identity(value):
+    return value
+
+
+def _enum_converter(enum_type):
+    names = {v.number: v.name for v in enum_type.values}
+
+    def convert(value):
+        return names.get(value, value)
+    return convert
+
+
+def _scalar_converter(field):
+    ftype = field.type
+    if ftype == FieldDescriptor.TYPE_MESSAGE or ftype == FieldDescriptor.TYPE_GROUP:
+        return message_to_dict
+    if ftype == FieldDescriptor.TYPE_ENUM:
+        return _enum_converter(field.enum_type)
+    if ftype == FieldDescriptor.TYPE_STRING:
+        return _convert_string
+    if ftype == FieldDescriptor.TYPE_BYTES:
+        return _convert_bytes
+    if ftype == FieldDescriptor.TYPE_FLOAT:
+        return _convert_float
+    if ftype == FieldDescriptor.TYPE_DOUBLE:
+        return _convert_double
+    if ftype in _INT64_TYPES:
+        return str
+    return _identity
+
+
+def _is_repeated(field):
+    # FieldDescriptor.label is gone in protobuf 7; is_repeated is the newer spelling
+    is_repeated = getattr(field, 'is_repeated', None)
+    if is_repeated is not None:
+        return is_repeated
+    return field.label == FieldDescriptor.LABEL_REPEATED
+
+
+def _build_converter(field):
+    message_type = field.message_type
+    if message_type is not None and message_type.GetOptions().map_entry:
+        key_convert = _scalar_converter(message_type.fields_by_name['key'])
+        value_convert = _scalar_converter(message_type.fields_by_name['value'])
+
+        def convert_map(mapping):
+            out = {}
+            for k, v in mapping.items():
+                k = key_convert(k)
+                v = value_convert(v)
+                if v is not _DROP:
+                    # JSON object keys are always strings
+                    out[str(k).lower() if isinstance(k, bool) else str(k)] = v
+            return out
+        return convert_map
+
+    convert = _scalar_converter(field)
+    if _is_repeated(field):
+        def convert_repeated(values):
+            out = []
+            for v in values:
+                v = convert(v)
+                if v is not _DROP:
+                    out.append(v)
+            return out
+        return convert_repeated
+    return convert
+
+
+def message_to_dict(msg, fields=None):
+    """Convert a protobuf message to a JSON-serializable dict (see module doc).
+
+    fields: optional set of top-level field names to keep (nested messages
+    under a kept field are converted in full).
+    """
+    out = {}
+    for field, value in msg.ListFields():
+        if fields is not None and field.name not in fields:
+            continue
+        convert = _FIELD_CONVERTERS.get(field)
+        if convert is None:
+            convert = _FIELD_CONVERTERS[field] = _build_converter(field)
+        value = convert(value)
+        if value is not _DROP:
+            out[field.name] = value
+    return out
@@ -1,6 +1,9 @@
 """MQTT topic parsing and display-text sanitization helpers."""
 
 import logging
+import re
+import sys
+from collections import namedtuple
 
 logger = logging.getLogger(__name__)
 
@@ -8,6 +11,12 @@ logger = logging.getLogger(__name__)
 # Defense-in-depth against stored XSS — the web frontend also escapes at render time.
 _UNSAFE_DISPLAY_CHARS = {ord(c): None for c in '<>"\''}
 
+# The path segment right after the first 'e' segment (the channel, unless it is a !nodeid)
+_CHANNEL_RE = re.compile(r'(?:^|/)e/([^/]*)')
+
+# Everything the MQTT path tells us about a packet, parsed once on receipt
+TopicInfo = namedtuple('TopicInfo', ['channel_name', 'gateway_id'])
+
 
 def sanitize_display_text(text):
     """Strip characters that could break out of HTML contexts from MQTT-sourced text."""
@@ -16,22 +25,25 @@ def sanitize_display_text(text):
     return text.translate(_UNSAFE_DISPLAY_CHARS)
 
 
+def _channel_display_name(raw):
+    """Sanitized channel name, interned: a feed only ever carries a handful of
+    channel names, so every packet and node shares one string object per name."""
+    return sys.intern(sanitize_display_text(raw))
+
+
 def channel_from_topic(topic: str) -> str:
     """
     Extract channel name from MQTT topic path.
     Topic format: msh/US/bayarea/2/e/CHANNEL_NAME/!nodeid/...
     Returns channel name or "Unknown" if not found.
     """
-    try:
-        parts = topic.split('/')
-        if 'e' in parts:
-            e_idx = parts.index('e')
-            if e_idx + 1 < len(parts):
-                channel = parts[e_idx + 1]
-                if not channel.startswith('!'):
-                    return sanitize_display_text(channel)
-    except Exception as e:
-        logger.debug(f"Error extracting channel from topic {topic}: {e}")
+    if not isinstance(topic, str):
+        return "Unknown"
+    match = _CHANNEL_RE.search(topic)
+    if match:
+        channel = match.group(1)
+        if not channel.startswith('!'):
+            return _channel_display_name(channel)
     return "Unknown"
 
 
@@ -51,3 +63,68 @@ def gateway_id_from_topic(topic: str) -> int:
     except Exception as e:
         logger.debug(f"Error extracting gateway node ID from topic {topic}: {e}")
     return None
+
+
+def parse_topic(topic: str) -> TopicInfo:
+    """
+    Parse channel name and gateway node ID from an MQTT topic in one pass.
+    Same results as channel_from_topic() and gateway_id_from_topic(), for the
+    receive path where both are needed for every message.
+    """
+    if not isinstance(topic, str):
+        return TopicInfo("Unknown", None)
+
+    # Fast path for the standard layout .../e/CHANNEL/!gateway[/...]: locate
+    # the segments by offset with str.find instead of splitting the topic.
+    # Only taken if nothing before them contains a '!' (possible !nodeid).
+    if topic.startswith('e/'):
+        chan_start = 2
+    else:
+        chan_start = topic.find('/e/')
+        chan_start = chan_start + 3 if chan_start >= 0 else -1
+    if chan_start > 0:
+        chan_end = topic.find('/', chan_start)
+        token_start = chan_end + 1
+        if (chan_end > chan_start and topic[chan_start] != '!'
+                and topic.startswith('!', token_start) and '!' not in topic[:chan_start]):
+            token_end = topic.find('/', token_start)
+            if token_end < 0:
+                token_end = len(topic)
+            try:
+                return TopicInfo(_channel_display_name(topic[chan_start:chan_end]),
+                                 int(topic[token_start + 1:token_end], 16))
+            except ValueError:
+                pass  # malformed id; the general walk below logs and handles it
+
+    parts = topic.split('/')
+
+    # Channel: the segment after the first 'e' segment, taken as-is unless it
+    # is a !nodeid (as in channel_from_topic())
+    channel_name = "Unknown"
+    if 'e' in parts:
+        e_idx = parts.index('e')
+        if e_idx + 1 < len(parts) and not parts[e_idx + 1].startswith('!'):
+            channel_name = _channel_display_name(parts[e_idx + 1])
+
+    # Gateway: only the first !token counts, as in gateway_id_from_topic()
+    gateway_id = None
+    for part in parts:
+        if part.startswith('!'):
+            try:
+                gateway_id = int(part[1:], 16)
+            except ValueError as e:
+                logger.debug(f"Error extracting gateway node ID from topic {topic}: {e}")
+            break
+    return TopicInfo(channel_name, gateway_id)
+
+
+def packet_gateway_id(json_data):
+    """
+    Gateway node ID for a decoded packet. Live MQTT packets carry it from
+    parse_topic() (json_data['gateway_id']); simulated or injected packets
+    only have mqtt_topic, so fall back to parsing that.
+    """
+    if 'gateway_id' in json_data:
+        return json_data['gateway_id']
+    topic = json_data.get('mqtt_topic')
+    return gateway_id_from_topic(topic) if topic else None